@@ -1,10 +1,15 @@
 from jose import JWTError, jwt
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy import event, inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, make_transient_to_detached
 from sqlalchemy.exc import SQLAlchemyError
 from app import database, models
+from app.services.cache import TTLCache
+import hashlib
 import os
+import time
 from datetime import datetime, timedelta
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="login")
@@ -17,6 +22,16 @@ if not SECRET_KEY:
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
+# Authentication caches: decoded claims keyed by token hash, resolved users keyed by id
+AUTH_CACHE_TTL = float(os.getenv("AUTH_CACHE_TTL", "60"))
+AUTH_CACHE_MAXSIZE = int(os.getenv("AUTH_CACHE_MAXSIZE", "4096"))
+
+token_cache = TTLCache(maxsize=AUTH_CACHE_MAXSIZE, ttl=AUTH_CACHE_TTL)
+user_cache = TTLCache(maxsize=AUTH_CACHE_MAXSIZE, ttl=AUTH_CACHE_TTL)
+
+# Changes to these columns must be visible to the very next request
+_AUTH_RELEVANT_FIELDS = ("is_active", "role", "email", "hashed_password")
+
 def create_access_token(data: dict):
     to_encode = data.copy()
     expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
@@ -24,14 +39,45 @@ def create_access_token(data: dict):
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(database.get_db)):
+def invalidate_user(user_id: int) -> None:
+    """Drop a cached user so the next request reloads it from the database."""
+    user_cache.delete(user_id)
+
+def get_auth_cache_stats() -> dict:
+    """Hit/miss counters for the token and user caches."""
+    return {"tokens": token_cache.stats(), "users": user_cache.stats()}
+
+def _decode_token(token: str) -> dict:
+    """Decode a JWT, reusing the claims of recently seen tokens."""
+    key = hashlib.sha256(token.encode()).hexdigest()
+    payload = token_cache.get(key)
+    if payload is not None:
+        if payload.get("exp", 0) > time.time():
+            return payload
+        token_cache.delete(key)
+
+    payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    # Never keep claims around past the token's own expiry
+    remaining = payload.get("exp", 0) - time.time()
+    if remaining > 0:
+        token_cache.set(key, payload, ttl=min(AUTH_CACHE_TTL, remaining))
+    return payload
+
+def _detached_copy(user: models.User) -> models.User:
+    """Build a session-independent snapshot of a user that is safe to share."""
+    mapper = inspect(models.User)
+    snapshot = models.User(**{attr.key: getattr(user, attr.key) for attr in mapper.column_attrs})
+    make_transient_to_detached(snapshot)
+    return snapshot
+
+async def get_current_user(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(database.get_async_db)):
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = _decode_token(token)
         user_id: int = payload.get("user_id")
         token_type: str = payload.get("typ")
         
@@ -41,13 +87,49 @@ def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(
     except JWTError:
         raise credentials_exception
 
-    try:
-        user = db.query(models.User).filter(models.User.id == user_id).first()
-        if user is None:
+    user = user_cache.get(user_id)
+    if user is None:
+        try:
+            result = await db.execute(select(models.User).where(models.User.id == user_id))
+            db_user = result.scalars().first()
+        except SQLAlchemyError:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Database error occurred"
+            )
+        if db_user is None:
             raise credentials_exception
-        return user
-    except SQLAlchemyError:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Database error occurred"
-        )
+        user = _detached_copy(db_user)
+        user_cache.set(user_id, user)
+
+    if user.is_active is False:
+        raise credentials_exception
+    return user
+
+
+async def require_admin(current_user: models.User = Depends(get_current_user)):
+    if current_user.role != "admin":
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin privileges required")
+    return current_user
+
+
+@event.listens_for(models.User, "after_update")
+def _user_updated(mapper, connection, target):
+    state = inspect(target)
+    if any(state.attrs[field].history.has_changes() for field in _AUTH_RELEVANT_FIELDS):
+        invalidate_user(target.id)
+        # Invalidate again on commit so a concurrent miss cannot re-cache pre-commit data
+        session = state.session
+        if session is not None:
+            session.info.setdefault("invalidated_user_ids", set()).add(target.id)
+
+
+@event.listens_for(models.User, "after_delete")
+def _user_deleted(mapper, connection, target):
+    invalidate_user(target.id)
+
+
+@event.listens_for(Session, "after_commit")
+def _flush_user_invalidations(session):
+    for user_id in session.info.pop("invalidated_user_ids", ()):
+        invalidate_user(user_id)
@@ -0,0 +1,28 @@
+"""Helpers shared by the ``POST .../bulk`` endpoints."""
+
+from fastapi import Body, HTTPException
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+from typing import Dict, List, Sequence
+import os
+
+MAX_BULK_ROWS = int(os.getenv("MAX_BULK_ROWS", "5000"))
+
+
+def bulk_body():
+    return Body(..., min_length=1, max_length=MAX_BULK_ROWS, description=f"Up to {MAX_BULK_ROWS} rows")
+
+
+def raise_row_errors(errors: List[Dict]) -> None:
+    """Reject the whole batch if any row failed validation."""
+    if errors:
+        raise HTTPException(status_code=422, detail=errors)
+
+
+def insert_returning(db: Session, model, rows: Sequence[Dict]) -> list:
+    """Insert many rows in one executemany (batched VALUES) and return them as ORM objects.
+
+    This bypasses per-object unit-of-work bookkeeping, so mapper events such
+    as ``after_insert`` do not fire; callers maintain derived data themselves.
+    """
+    return db.scalars(insert(model).returning(model, sort_by_parameter_order=True), list(rows)).all()
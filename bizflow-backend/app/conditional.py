@@ -0,0 +1,118 @@
+"""Conditional GET support: ``ETag`` / ``If-None-Match`` and ``Last-Modified`` / ``If-Modified-Since``.
+
+Validators come from a cheap stamp of the tables a response is built from:
+``count(*)``, ``max`` of the primary key and, where the table has one,
+``max(updated_at)``, filtered the same way as the response. Inserts move the
+count and the key, updates move ``updated_at`` and deletes move the count, so
+an unchanged stamp means unchanged data. The stamp is read before the rows, so a client whose copy
+is current gets a 304 without any row being loaded or serialized. Because the
+stamp comes from the database, every worker process agrees on it.
+
+A list's newest ``updated_at`` does not move when one of its rows is deleted,
+so lists send ``Last-Modified`` for information only; for them only
+``If-None-Match`` can produce a 304. Detail endpoints honor both.
+"""
+
+from fastapi import Request, Response, status
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Iterable, Optional, Tuple
+import hashlib
+
+# Authenticated data: browsers may keep a copy but must revalidate it on every use
+CACHE_CONTROL = "private, no-cache"
+
+
+def table_stamp(model, *criteria):
+    """Select ``count(*)``, ``max(<primary key>)`` and ``max(updated_at)`` (if any) over the rows of ``model`` matching ``criteria``."""
+    columns = [func.count(), func.max(next(iter(model.__table__.primary_key)))]
+    updated_at = model.__table__.c.get("updated_at")
+    if updated_at is not None:
+        columns.append(func.max(updated_at))
+    return select(*columns).select_from(model).where(*criteria)
+
+
+def _as_utc(value: datetime) -> datetime:
+    # Naive timestamps in this schema are UTC
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    if header.strip() == "*":
+        return True
+    # Weak comparison: If-None-Match ignores the W/ prefix
+    wanted = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == wanted for tag in header.split(","))
+
+
+def _not_modified_since(header: str, last_modified: datetime) -> bool:
+    try:
+        since = parsedate_to_datetime(header)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        return False
+    # HTTP dates have one second resolution
+    return _as_utc(last_modified).replace(microsecond=0) <= since
+
+
+def check_validators(
+    request: Request,
+    response: Response,
+    parts: Iterable[Any],
+    last_modified: Optional[datetime] = None,
+    honor_since: bool = True,
+) -> Optional[Response]:
+    """Set the validators derived from ``parts`` on ``response``.
+
+    Returns a 304 response when the request's preconditions show the client's
+    copy is current, else ``None`` and the endpoint builds the body as usual.
+    ``parts`` must change whenever the body would.
+    """
+    # The query string is part of the representation (filters, cursor, limit)
+    raw = "|".join([request.url.path, request.url.query, *map(str, parts)])
+    etag = f'W/"{hashlib.sha1(raw.encode()).hexdigest()}"'
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(_as_utc(last_modified), usegmt=True)
+    response.headers.update(headers)
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        # If-Modified-Since is ignored when If-None-Match is present
+        fresh = _etag_matches(if_none_match, etag)
+    else:
+        if_modified_since = request.headers.get("if-modified-since")
+        fresh = bool(honor_since and last_modified is not None and if_modified_since
+                     and _not_modified_since(if_modified_since, last_modified))
+    if fresh:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return None
+
+
+async def read_stamps(db: AsyncSession, *stamps) -> Tuple[tuple, ...]:
+    """Run the ``table_stamp`` queries in ``stamps``.
+
+    The result is hashable, so a cache can key on it and never hand out a body
+    older than the ETag derived from the same stamp.
+    """
+    return tuple([tuple((await db.execute(stamp)).one()) for stamp in stamps])
+
+
+def check_stamp_values(request: Request, response: Response, values: Iterable[tuple]) -> Optional[Response]:
+    """``check_validators`` for a list or report whose stamps were read with ``read_stamps``."""
+    parts = []
+    updated = []
+    for row in values:
+        parts.extend(row)
+        updated.append(row[2] if len(row) > 2 else None)
+    # Only a date covering every table read is a meaningful Last-Modified
+    last_modified = max(map(_as_utc, updated)) if updated and None not in updated else None
+    return check_validators(request, response, parts, last_modified, honor_since=False)
+
+
+async def check_stamps(request: Request, response: Response, db: AsyncSession, *stamps) -> Optional[Response]:
+    """``check_validators`` for a list or report built from the ``table_stamp`` queries in ``stamps``."""
+    return check_stamp_values(request, response, await read_stamps(db, *stamps))
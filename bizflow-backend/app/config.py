@@ -0,0 +1,77 @@
+"""Application settings read from the environment.
+
+``create_app`` takes a ``Settings`` instance so tests and scripts can build an
+app with different options without touching ``os.environ``.
+"""
+
+from dataclasses import dataclass, field
+from typing import List, Optional
+import os
+
+DEFAULT_ORIGINS = [
+    "http://localhost:3000",
+    "http://localhost:5173",
+    "http://localhost:5174",
+    "http://127.0.0.1:3000",
+    "http://127.0.0.1:5173",
+    "http://127.0.0.1:5174",
+]
+
+SCHEMA_MODES = ("create", "check", "off")
+
+
+def _flag(name: str, default: str) -> bool:
+    return os.getenv(name, default).lower() == "true"
+
+
+@dataclass
+class Settings:
+    development: bool = True
+    allowed_origins: List[str] = field(default_factory=lambda: list(DEFAULT_ORIGINS))
+    # create: create missing tables and stamp the schema version (development)
+    # check:  only compare the stamped schema version with the models (one query)
+    # off:    skip schema handling entirely
+    schema_mode: str = "create"
+    seed_default_user: bool = False
+    log_file: Optional[str] = None
+    log_format: str = "json"  # or "text"
+    log_level: str = "INFO"
+    log_max_bytes: int = 10 * 1024 * 1024
+    log_backup_count: int = 5
+    log_queue_size: int = 10000
+    # Share of successful requests written to the request log; errors and slow requests always are
+    log_sample_rate: float = 1.0
+    slow_request_ms: float = 1000.0
+    index_audit_on_startup: bool = False
+    outbox_worker_enabled: bool = True
+
+    def __post_init__(self):
+        if self.schema_mode not in SCHEMA_MODES:
+            raise ValueError(f"SCHEMA_MODE must be one of {', '.join(SCHEMA_MODES)}, got {self.schema_mode!r}")
+
+    @classmethod
+    def from_env(cls) -> "Settings":
+        development = _flag("DEVELOPMENT", "true")
+        if os.getenv("ALLOWED_ORIGINS"):
+            origins = os.getenv("ALLOWED_ORIGINS").split(",")
+        elif development:
+            # In development, be more permissive
+            origins = ["*"]
+        else:
+            origins = list(DEFAULT_ORIGINS)
+        return cls(
+            development=development,
+            allowed_origins=origins,
+            schema_mode=os.getenv("SCHEMA_MODE", "create").lower(),
+            seed_default_user=_flag("SEED_DEFAULT_USER", "false"),
+            log_file=os.getenv("LOG_FILE") or None,
+            log_format=os.getenv("LOG_FORMAT", "json").lower(),
+            log_level=os.getenv("LOG_LEVEL", "INFO").upper(),
+            log_max_bytes=int(os.getenv("LOG_MAX_BYTES", str(10 * 1024 * 1024))),
+            log_backup_count=int(os.getenv("LOG_BACKUP_COUNT", "5")),
+            log_queue_size=int(os.getenv("LOG_QUEUE_SIZE", "10000")),
+            log_sample_rate=float(os.getenv("LOG_SAMPLE_RATE", "1.0")),
+            slow_request_ms=float(os.getenv("SLOW_REQUEST_MS", "1000")),
+            index_audit_on_startup=_flag("INDEX_AUDIT_ON_STARTUP", "false"),
+            outbox_worker_enabled=_flag("OUTBOX_WORKER_ENABLED", "true"),
+        )
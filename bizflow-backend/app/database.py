@@ -1,13 +1,17 @@
-from sqlalchemy import create_engine, text
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 from sqlalchemy.pool import QueuePool
 import os
+import threading
 from dotenv import load_dotenv
 import logging
 from contextlib import contextmanager
 import time
-from typing import Generator
+from typing import AsyncGenerator, Generator, Optional
 
 # Load environment variables
 load_dotenv()
@@ -18,32 +22,55 @@ logger = logging.getLogger(__name__)
 # Check if we should use SQLite for development
 USE_SQLITE = os.getenv("USE_SQLITE", "true").lower() == "true"
 DB_PASSWORD = os.getenv("DB_PASSWORD")
+SQL_ECHO = os.getenv("SQL_ECHO", "false").lower() == "true"
+
+# Connection pool settings (shared by the sync and async engines)
+POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", "30"))
+POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))  # 30 minutes
+
+# SQLite tuning
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+SQLITE_CACHE_SIZE_KB = int(os.getenv("SQLITE_CACHE_SIZE_KB", "65536"))  # 64 MiB page cache per connection
+SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
 
 if USE_SQLITE or not DB_PASSWORD:
     # Use SQLite for development
     DATABASE_URL = "sqlite:///./bizflow.db"
+    ASYNC_DATABASE_URL = "sqlite+aiosqlite:///./bizflow.db"
     logger.info("Using SQLite database for development")
     
     # Create engine for SQLite
     engine = create_engine(
         DATABASE_URL,
         connect_args={"check_same_thread": False},  # Required for SQLite
-        echo=os.getenv("SQL_ECHO", "false").lower() == "true"
+        echo=SQL_ECHO
     )
+    async_engine = create_async_engine(ASYNC_DATABASE_URL, echo=SQL_ECHO)
+
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        """Apply WAL mode and tuning pragmas to every new SQLite connection."""
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}")
+        cursor.execute(f"PRAGMA cache_size=-{SQLITE_CACHE_SIZE_KB}")
+        cursor.execute(f"PRAGMA mmap_size={SQLITE_MMAP_SIZE}")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.close()
+
+    event.listen(engine, "connect", _set_sqlite_pragmas)
+    event.listen(async_engine.sync_engine, "connect", _set_sqlite_pragmas)
 else:
     # Use PostgreSQL for production
     DB_HOST = os.getenv("DB_HOST", "localhost")
     DB_PORT = os.getenv("DB_PORT", "5432")
     DB_NAME = os.getenv("DB_NAME", "bizflow")
     DB_USER = os.getenv("DB_USER", "postgres")
-    
-    # Connection pool settings
-    POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
-    MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
-    POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", "30"))
-    POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))  # 30 minutes
 
     DATABASE_URL = f"postgresql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+    ASYNC_DATABASE_URL = f"postgresql+asyncpg://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
     logger.info("Using PostgreSQL database for production")
     
     # Create engine with connection pooling
@@ -55,7 +82,16 @@ else:
         pool_timeout=POOL_TIMEOUT,
         pool_recycle=POOL_RECYCLE,
         pool_pre_ping=True,  # Enable connection health checks
-        echo=os.getenv("SQL_ECHO", "false").lower() == "true"
+        echo=SQL_ECHO
+    )
+    async_engine = create_async_engine(
+        ASYNC_DATABASE_URL,
+        pool_size=POOL_SIZE,
+        max_overflow=MAX_OVERFLOW,
+        pool_timeout=POOL_TIMEOUT,
+        pool_recycle=POOL_RECYCLE,
+        pool_pre_ping=True,
+        echo=SQL_ECHO
     )
 
 # Create session factory
@@ -66,8 +102,78 @@ SessionLocal = sessionmaker(
     expire_on_commit=False
 )
 
+# Async session factory for routes that should not hold a threadpool thread during DB I/O
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    autoflush=False,
+    expire_on_commit=False
+)
+
+IS_SQLITE = engine.dialect.name == "sqlite"
+
+
+class SQLiteWriteGate:
+    """Serializes write transactions of this process on a single lock.
+
+    SQLite allows one writer at a time. Letting threads race for the database
+    lock means busy-waiting and, under load, "database is locked" errors.
+    Sessions instead queue here as soon as they are about to write (first
+    flush or DML statement) and leave when their transaction ends. pysqlite
+    only opens a transaction before the first DML statement, so reads before
+    that point run without a lock and concurrently with the writer.
+    """
+
+    def __init__(self, timeout: float):
+        self.timeout = timeout
+        self._lock = threading.Lock()
+
+    def acquire(self, session: Session) -> None:
+        if session.info.get("sqlite_write_gate"):
+            return
+        if not self._lock.acquire(timeout=self.timeout):
+            # Fall back to SQLite's own busy handler rather than failing the request
+            logger.warning("Timed out waiting for the SQLite write gate")
+            return
+        session.info["sqlite_write_gate"] = True
+
+    def release(self, session: Session) -> None:
+        if session.info.pop("sqlite_write_gate", False):
+            self._lock.release()
+
+
+write_gate = SQLiteWriteGate(timeout=SQLITE_BUSY_TIMEOUT_MS / 1000) if IS_SQLITE else None
+
+if write_gate is not None:
+    @event.listens_for(SessionLocal, "before_flush")
+    def _gate_flush(session, flush_context, instances):
+        write_gate.acquire(session)
+
+    @event.listens_for(SessionLocal, "do_orm_execute")
+    def _gate_dml(orm_execute_state):
+        if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+            write_gate.acquire(orm_execute_state.session)
+
+    @event.listens_for(SessionLocal, "after_transaction_end")
+    def _release_gate(session, transaction):
+        if transaction.parent is None:
+            write_gate.release(session)
+
 Base = declarative_base()
 
+def increment_row(connection, table, keys: dict, increments: dict, assign: Optional[dict] = None) -> None:
+    """Add ``increments`` to the row of ``table`` identified by ``keys``, inserting it if missing.
+
+    Columns in ``assign`` are set outright either way. One ``INSERT ... ON
+    CONFLICT DO UPDATE`` statement, so concurrent writers creating the same row
+    cannot collide on its primary key.
+    """
+    assign = assign or {}
+    insert = postgresql_insert if connection.dialect.name == "postgresql" else sqlite_insert
+    stmt = insert(table).values(**keys, **increments, **assign)
+    set_ = {name: table.c[name] + stmt.excluded[name] for name in increments}
+    set_.update({name: stmt.excluded[name] for name in assign})
+    connection.execute(stmt.on_conflict_do_update(index_elements=list(keys), set_=set_))
+
 def get_db():
     db = SessionLocal()
     try:
@@ -75,25 +181,36 @@ def get_db():
     finally:
         db.close()
 
-def init_db() -> None:
-    """Initialize database connection and verify connectivity."""
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    async with AsyncSessionLocal() as db:
+        yield db
+
+def init_db(schema_mode: str = "create", seed_default_user: bool = False) -> None:
+    """Prepare the schema (see ``app.schema``) and verify connectivity."""
+    from app import schema
+
     try:
-        # Import all models to ensure they're registered
-        try:
-            from app import models  # This imports all models
-        except ImportError as e:
-            logger.warning(f"Could not import models: {str(e)}")
-        
-        # Create all tables
-        Base.metadata.create_all(bind=engine)
-        
+        if schema_mode == "create":
+            schema.create(engine)
+        elif schema_mode == "check":
+            schema.check(engine)
+
         # Test database connection
         db = SessionLocal()
         db.execute(text("SELECT 1"))
         logger.info("Database connection successful")
-        
-        # Create default admin user if SQLite and doesn't exist
-        if USE_SQLITE or not DB_PASSWORD:
+
+        if schema_mode == "create":
+            # Backfill derived tables for databases that predate them
+            from app.services.task_counters import ensure_counters
+            from app.services.rollups import ensure_rollups
+            from app.services.search import ensure_search
+            ensure_counters(db)
+            ensure_rollups(db)
+            ensure_search(db)
+
+        # Opt-in: hashing the default password costs a bcrypt round on every start
+        if seed_default_user:
             create_default_user(db)
             
     except Exception as e:
@@ -0,0 +1,45 @@
+"""Direct-to-bytes JSON for large list responses.
+
+Returning ORM rows with ``response_model=List[...]`` makes FastAPI validate
+the list and, on versions before its own bytes fast path (or whenever a
+response class is set), convert it to Python dicts and run them through
+``json.dumps``. ``json_list`` validates the rows and serializes them to JSON
+bytes in one pass through pydantic-core's Rust serializer, using a
+``TypeAdapter`` built once per schema. Keep ``response_model`` on the route
+for the OpenAPI schema.
+"""
+
+from functools import lru_cache
+from fastapi import Response
+from pydantic import TypeAdapter
+from typing import List, Optional, Sequence
+
+
+@lru_cache(maxsize=None)
+def list_adapter(schema) -> TypeAdapter:
+    return TypeAdapter(List[schema])
+
+
+def json_list(schema, rows: Sequence, response: Optional[Response] = None) -> Response:
+    """Serialize ``rows`` (ORM objects or dicts) as a JSON array of ``schema``.
+
+    Headers already set on the injected ``response`` (e.g. ``X-Next-Cursor``)
+    are carried over, since FastAPI does not merge them into returned responses.
+    """
+    adapter = list_adapter(schema)
+    body = adapter.dump_json(adapter.validate_python(rows, from_attributes=True), by_alias=True)
+    return _json_response(body, response)
+
+
+def json_one(schema, obj, response: Optional[Response] = None) -> Response:
+    """Serialize a single ``obj`` as ``schema``; see ``json_list``."""
+    return _json_response(schema.model_validate(obj, from_attributes=True).model_dump_json(by_alias=True), response)
+
+
+def _json_response(body, response: Optional[Response]) -> Response:
+    fast = Response(content=body, media_type="application/json")
+    if response is not None:
+        fast.headers.raw.extend(
+            (key, value) for key, value in response.headers.raw if key != b"content-length"
+        )
+    return fast
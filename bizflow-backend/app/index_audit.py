@@ -0,0 +1,186 @@
+"""Compare declared indexes with the live database and EXPLAIN the hot queries.
+
+Run it from the backend directory:
+
+    python -m app.index_audit                  # report only
+    python -m app.index_audit --create-missing # also create declared indexes missing from the database
+
+``Base.metadata.create_all`` never adds indexes to tables that already exist,
+so databases created before an index was declared drift silently. The audit
+reports such drift and flags every hot query whose plan is a full table scan.
+"""
+
+from dataclasses import dataclass, field
+from datetime import datetime
+from sqlalchemy import func, inspect, select
+from sqlalchemy.engine import Connection, Engine
+from typing import Dict, List, Tuple
+import json
+import logging
+import re
+import sys
+
+from app import models
+from app.database import Base, engine as default_engine
+
+logger = logging.getLogger(__name__)
+
+
+def _hot_queries():
+    """Representative statements for the filters used by the routers."""
+    Task = models.Task
+    Entry = models.AccountingEntry
+    return {
+        "tasks by project and status (projects.get_project_progress)": select(func.count(Task.id)).where(
+            Task.project_id == 1, Task.status == models.task.TaskStatus.done
+        ),
+        "tasks by assignee (task.get_tasks)": select(Task.id).where(Task.assignee_id == 1),
+        "tasks by status (task.get_tasks)": select(Task.id).where(Task.status == models.task.TaskStatus.todo),
+        "overdue tasks (task.get_tasks)": select(Task.id).where(
+            Task.due_date < datetime(2024, 1, 1), Task.status != models.task.TaskStatus.done
+        ),
+        "tasks by assignee due in a range (task.get_tasks)": select(Task.id).where(
+            Task.assignee_id == 1, Task.due_date >= datetime(2024, 1, 1), Task.due_date <= datetime(2024, 1, 8)
+        ),
+        "tasks by priority (task.get_tasks)": select(Task.id).where(Task.priority == models.task.TaskPriority.high),
+        "tasks updated since (task.get_tasks)": select(Task.id).where(Task.updated_at >= datetime(2024, 1, 1)),
+        "accounting by project (reporting.report_by_project)": select(Entry.type, func.sum(Entry.amount)).where(
+            Entry.project_id == 1
+        ).group_by(Entry.type),
+        "accounting by task (accounting.get_entries_by_task)": select(Entry.id).where(Entry.task_id == 1),
+        "transactions by item (inventory_transaction.get_transactions_for_item)": select(
+            models.InventoryTransaction.id
+        ).where(models.InventoryTransaction.item_id == 1),
+        "time entries by user (time_entry.get_my_time_entries)": select(models.TimeEntry.id).where(
+            models.TimeEntry.user_id == 1
+        ),
+        "time entries in a date range (time_entry.get_all_timesheets)": select(models.TimeEntry.id).where(
+            models.TimeEntry.start_time >= datetime(2024, 1, 1), models.TimeEntry.start_time < datetime(2024, 1, 8)
+        ),
+        "financial totals by type (report.get_financial_summary)": select(
+            func.sum(models.FinancialRecord.amount)
+        ).where(models.FinancialRecord.type == models.financial_record.RecordType.expense),
+    }
+
+
+@dataclass
+class AuditReport:
+    missing_indexes: List[Tuple[str, str, List[str]]] = field(default_factory=list)
+    mismatched_indexes: List[Tuple[str, str, List[str], List[str]]] = field(default_factory=list)
+    undeclared_indexes: List[Tuple[str, str, List[str]]] = field(default_factory=list)
+    full_scans: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def ok(self) -> bool:
+        return not (self.missing_indexes or self.mismatched_indexes or self.full_scans)
+
+    def lines(self) -> List[str]:
+        out = []
+        for table, name, columns in self.missing_indexes:
+            out.append(f"MISSING    {table}.{name} ({', '.join(columns)})")
+        for table, name, declared, live in self.mismatched_indexes:
+            out.append(f"MISMATCH   {table}.{name} declared ({', '.join(declared)}) live ({', '.join(live)})")
+        for table, name, columns in self.undeclared_indexes:
+            out.append(f"UNDECLARED {table}.{name} ({', '.join(columns)})")
+        for query, plan in self.full_scans.items():
+            out.append(f"FULL SCAN  {query}: {plan}")
+        return out
+
+
+def _declared_indexes() -> Dict[str, Dict[str, List[str]]]:
+    declared = {}
+    for table in Base.metadata.sorted_tables:
+        declared[table.name] = {index.name: [column.name for column in index.columns] for index in table.indexes}
+    return declared
+
+
+def _sqlite_full_scan(conn: Connection, sql: str) -> str:
+    rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}").fetchall()
+    for row in rows:
+        detail = row[-1]
+        # "SCAN tasks" is a table scan; "SCAN tasks USING (COVERING) INDEX ..." is not
+        if re.match(r"SCAN \w+$", detail):
+            return detail
+    return ""
+
+
+def _postgres_full_scan(conn: Connection, sql: str) -> str:
+    # With sequential scans disabled the planner only picks one when no index applies
+    with conn.begin():
+        conn.exec_driver_sql("SET LOCAL enable_seqscan = off")
+        plan = conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {sql}").scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    nodes = [plan[0]["Plan"]]
+    while nodes:
+        node = nodes.pop()
+        if node.get("Node Type") == "Seq Scan":
+            return f"Seq Scan on {node.get('Relation Name')}"
+        nodes.extend(node.get("Plans", []))
+    return ""
+
+
+def audit(bind: Engine = None, create_missing: bool = False) -> AuditReport:
+    """Run the index audit against ``bind`` (the application engine by default)."""
+    bind = bind or default_engine
+    report = AuditReport()
+
+    with bind.connect() as conn:
+        inspector = inspect(conn)
+        live_tables = set(inspector.get_table_names())
+        for table_name, declared in _declared_indexes().items():
+            if table_name not in live_tables:
+                continue
+            live = {index["name"]: index["column_names"] for index in inspector.get_indexes(table_name)}
+            for name, columns in declared.items():
+                if name not in live:
+                    report.missing_indexes.append((table_name, name, columns))
+                elif live[name] != columns:
+                    report.mismatched_indexes.append((table_name, name, columns, live[name]))
+            for name, columns in live.items():
+                if name not in declared:
+                    report.undeclared_indexes.append((table_name, name, columns))
+
+    if create_missing and report.missing_indexes:
+        for table_name, name, _ in report.missing_indexes:
+            index = next(i for i in Base.metadata.tables[table_name].indexes if i.name == name)
+            index.create(bind=bind, checkfirst=True)
+            logger.info("Created index %s on %s", name, table_name)
+        report.missing_indexes = []
+
+    explain = _sqlite_full_scan if bind.dialect.name == "sqlite" else _postgres_full_scan
+    with bind.connect() as conn:
+        for name, stmt in _hot_queries().items():
+            sql = str(stmt.compile(dialect=bind.dialect, compile_kwargs={"literal_binds": True}))
+            try:
+                plan = explain(conn, sql)
+            except Exception as e:
+                logger.warning("Could not EXPLAIN hot query %r: %s", name, e)
+                continue
+            if plan:
+                report.full_scans[name] = plan
+
+    return report
+
+
+def log_audit(bind: Engine = None) -> AuditReport:
+    """Run the audit and log its findings; used at application startup."""
+    report = audit(bind)
+    for line in report.lines():
+        logger.warning("Index audit: %s", line)
+    if report.ok:
+        logger.info("Index audit passed")
+    return report
+
+
+def main(argv: List[str]) -> int:
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    report = audit(create_missing="--create-missing" in argv)
+    for line in report.lines():
+        print(line)
+    print("Index audit passed" if report.ok else "Index audit found problems")
+    return 0 if report.ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,157 @@
+"""Non-blocking logging setup and sampled JSON request logs.
+
+Loggers only put records on an in-memory queue; a ``QueueListener`` thread
+formats them and does the console and (rotating) file I/O, so no handler ever
+blocks the event loop. When the queue is full, records are dropped and counted
+rather than stalling requests.
+"""
+
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from time import perf_counter
+from typing import Dict, Optional
+import atexit
+import json
+import logging
+import queue
+import random
+
+from app.config import Settings
+
+request_logger = logging.getLogger("app.requests")
+
+# Attributes every LogRecord has; anything else was passed through ``extra``
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "taskName"}
+
+
+class JSONFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS:
+                entry[key] = value
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class DroppingQueueHandler(QueueHandler):
+    """QueueHandler that drops records instead of raising when the queue is full."""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+_listener: Optional[QueueListener] = None
+_queue_handler: Optional[DroppingQueueHandler] = None
+
+
+def configure_logging(settings: Settings) -> None:
+    """Route the root logger through a queue to console and optional rotating file handlers."""
+    global _listener, _queue_handler
+
+    if settings.log_format == "json":
+        formatter = JSONFormatter()
+    else:
+        formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    handlers = [logging.StreamHandler()]
+    if settings.log_file:
+        handlers.append(RotatingFileHandler(
+            settings.log_file, maxBytes=settings.log_max_bytes, backupCount=settings.log_backup_count
+        ))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    if _listener is not None:
+        _listener.stop()
+    log_queue = queue.Queue(maxsize=settings.log_queue_size)
+    _queue_handler = DroppingQueueHandler(log_queue)
+    _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(_queue_handler)
+    root.setLevel(settings.log_level)
+
+
+def _stop_listener() -> None:
+    if _listener is not None:
+        # Flushes records still queued at interpreter exit
+        _listener.stop()
+
+
+atexit.register(_stop_listener)
+
+
+def get_logging_stats() -> Dict[str, int]:
+    if _queue_handler is None:
+        return {"queued": 0, "dropped": 0}
+    return {"queued": _queue_handler.queue.qsize(), "dropped": _queue_handler.dropped}
+
+
+class RequestLogMiddleware:
+    """ASGI middleware writing one JSON-friendly record per request.
+
+    Failed (status >= 400) and slow requests are always logged; other requests
+    are sampled at ``sample_rate``.
+    """
+
+    def __init__(self, app, sample_rate: float = 1.0, slow_ms: float = 1000.0):
+        self.app = app
+        self.sample_rate = sample_rate
+        self.slow_ms = slow_ms
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_holder = [500]
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status_holder[0] = message["status"]
+            await send(message)
+
+        started = perf_counter()
+        error = None
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            duration_ms = (perf_counter() - started) * 1000
+            status = status_holder[0]
+            failed = error is not None or status >= 400
+            if failed or duration_ms >= self.slow_ms or random.random() < self.sample_rate:
+                route = getattr(scope.get("route"), "path", None)
+                client = scope.get("client")
+                request_logger.log(
+                    logging.ERROR if status >= 500 or error is not None else logging.INFO,
+                    "%s %s %s %.1fms", scope["method"], scope["path"], status, duration_ms,
+                    extra={
+                        "method": scope["method"],
+                        "path": scope["path"],
+                        "route": route,
+                        "status": status,
+                        "duration_ms": round(duration_ms, 2),
+                        "client": client[0] if client else None,
+                        "error": str(error) if error is not None else None,
+                    },
+                )
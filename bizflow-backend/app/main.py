@@ -1,157 +1,206 @@
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from app.database import engine, Base, SessionLocal, init_db
+from fastapi.responses import JSONResponse, PlainTextResponse
 from sqlalchemy import text
-from app import models
+from contextlib import asynccontextmanager
+from typing import Optional
+import asyncio
+import importlib
 import logging
 import time
-from typing import Callable
-import os
 from dotenv import load_dotenv
 
-# Import all routers
-from app.routers.auth import router as auth_router
-from app.routers.user import router as user_router
-from app.routers.task import router as task_router
-from app.routers.project import router as project_router
-from app.routers.inventory import router as inventory_router
-from app.routers.inventory_transaction import router as inventory_transaction_router
-from app.routers.inventory_item import router as inventory_item_router
-from app.routers.financial_record import router as financial_record_router
-from app.routers.report import router as report_router
-from app.routers.time_entry import router as time_entry_router
-from app.routers.accounting import router as accounting_router
-from app.routers.reporting import router as reporting_router
+from app.config import Settings
+from app.logging_config import RequestLogMiddleware, configure_logging, get_logging_stats
 
 # Load environment variables
 load_dotenv()
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(),
-        logging.FileHandler('app.log')
-    ]
-)
 logger = logging.getLogger(__name__)
 
-# Initialize FastAPI app
-app = FastAPI(
-    title="BizFlow API",
-    description="Backend API for BizFlow application",
-    version="1.0.0",
-    docs_url="/docs",
-    redoc_url="/redoc"
-)
-
-# Configure CORS
-origins = [
-    "http://localhost:3000",
-    "http://localhost:5173", 
-    "http://localhost:5174",
-    "http://127.0.0.1:3000",
-    "http://127.0.0.1:5173",
-    "http://127.0.0.1:5174"
+# (module, attribute) of every router, imported when the app is built
+ROUTERS = [
+    ("app.routers.auth", "router"),
+    ("app.routers.user", "router"),
+    ("app.routers.task", "router"),
+    ("app.routers.project", "router"),
+    ("app.routers.inventory", "router"),
+    ("app.routers.inventory_transaction", "router"),
+    ("app.routers.inventory_item", "router"),
+    ("app.routers.financial_record", "router"),
+    ("app.routers.report", "router"),
+    ("app.routers.time_entry", "router"),
+    ("app.routers.accounting", "router"),
+    ("app.routers.reporting", "router"),
+    ("app.routers.export", "router"),
+    ("app.routers.search", "router"),
+    ("app.routers.dashboard", "router"),
 ]
 
-# Allow environment override or development mode
-if os.getenv("ALLOWED_ORIGINS"):
-    origins = os.getenv("ALLOWED_ORIGINS").split(",")
-elif os.getenv("DEVELOPMENT", "true").lower() == "true":
-    # In development, be more permissive
-    origins = ["*"]
-    logger.info("Development mode: Allowing all origins")
-
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=origins,
-    allow_credentials=True,
-    allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
-    allow_headers=["*"],
-)
-
-logger.info(f"CORS configured for origins: {origins}")
-
-# Request logging middleware
-@app.middleware("http")
-async def log_requests(request: Request, call_next: Callable):
-    start_time = time.time()
-    try:
-        response = await call_next(request)
-        process_time = time.time() - start_time
-        logger.info(
-            f"Method: {request.method} Path: {request.url.path} "
-            f"Status: {response.status_code} Duration: {process_time:.2f}s"
-        )
-        return response
-    except Exception as e:
-        process_time = time.time() - start_time
-        logger.error(
-            f"Method: {request.method} Path: {request.url.path} "
-            f"Error: {str(e)} Duration: {process_time:.2f}s"
-        )
-        raise
-
-# Global exception handler
-@app.exception_handler(Exception)
-async def global_exception_handler(request: Request, exc: Exception):
-    logger.error(f"Global error handler caught: {str(exc)}", exc_info=True)
-    return JSONResponse(
-        status_code=500,
-        content={"detail": "Internal server error"}
+
+_instrumented = False
+
+
+def _instrument_once() -> None:
+    """Engine hooks and scrape-time collectors are process-wide; register them once."""
+    global _instrumented
+    if _instrumented:
+        return
+    from app.database import engine, async_engine
+    from app.metrics import instrument_engine, pool_collector, registry, stats_collector
+    from app.auth_utils import get_auth_cache_stats
+    from app.services.password_hashing import get_pool_stats
+    from app.services.report_cache import get_report_cache_stats
+    from app.routers.dashboard import get_dashboard_cache_stats
+    from app.services.outbox_worker import worker as outbox_worker
+
+    instrument_engine(engine)
+    instrument_engine(async_engine.sync_engine)
+    registry.add_collector(pool_collector({"sync": engine, "async": async_engine.sync_engine}))
+    registry.add_collector(stats_collector("bizflow_auth_cache", "Authentication cache statistics.", get_auth_cache_stats))
+    registry.add_collector(stats_collector("bizflow_password_hash_pool", "Password hashing pool statistics.", get_pool_stats))
+    registry.add_collector(stats_collector("bizflow_report_cache", "Report cache statistics.", get_report_cache_stats))
+    registry.add_collector(stats_collector("bizflow_dashboard_cache", "Dashboard cache statistics.", get_dashboard_cache_stats))
+    registry.add_collector(stats_collector("bizflow_notification_outbox", "Notification outbox deliveries.", outbox_worker.stats))
+    registry.add_collector(stats_collector("bizflow_log_queue", "Log records queued for or dropped by the log writer.", get_logging_stats))
+    _instrumented = True
+
+
+def _startup(settings: Settings) -> None:
+    from app.database import init_db
+
+    init_db(schema_mode=settings.schema_mode, seed_default_user=settings.seed_default_user)
+
+    # Optionally compare declared indexes with the live schema and EXPLAIN hot queries
+    if settings.index_audit_on_startup:
+        from app.index_audit import log_audit
+        try:
+            log_audit()
+        except Exception as e:
+            logger.warning("Index audit failed: %s", e)
+
+
+def create_app(settings: Optional[Settings] = None) -> FastAPI:
+    settings = settings or Settings.from_env()
+    configure_logging(settings)
+
+    from app import query_recorder
+    from app.database import engine, async_engine, SessionLocal
+    from app.metrics import MetricsMiddleware, registry
+    from app.services.outbox_worker import worker as outbox_worker
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        # Initialize database off the event loop; a failure aborts startup
+        try:
+            await asyncio.to_thread(_startup, settings)
+        except Exception as e:
+            logger.error(f"Failed to initialize database: {str(e)}")
+            raise
+        # Deliver queued notifications in the background instead of inside requests
+        if settings.outbox_worker_enabled:
+            outbox_worker.start()
+        try:
+            yield
+        finally:
+            if settings.outbox_worker_enabled:
+                await outbox_worker.stop()
+
+    # Initialize FastAPI app
+    app = FastAPI(
+        lifespan=lifespan,
+        title="BizFlow API",
+        description="Backend API for BizFlow application",
+        version="1.0.0",
+        docs_url="/docs",
+        redoc_url="/redoc"
+    )
+    app.state.settings = settings
+
+    # Configure CORS
+    if settings.development and settings.allowed_origins == ["*"]:
+        logger.info("Development mode: Allowing all origins")
+
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=settings.allowed_origins,
+        allow_credentials=True,
+        allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
+        allow_headers=["*"],
+        expose_headers=["X-Next-Cursor", "X-Total-Count", "X-Total-Count-Capped", "X-DB-Queries", "X-DB-Time"],
     )
 
-# Initialize database
-try:
-    init_db()
-except Exception as e:
-    logger.error(f"Failed to initialize database: {str(e)}")
-    raise
-
-# Root endpoint
-@app.get("/")
-def root():
-    return {"message": "BizFlow backend is running"}
-
-# CORS test endpoint
-@app.get("/test-cors")
-def test_cors():
-    return {"status": "success", "message": "CORS is working correctly"}
-
-# Health check endpoint
-@app.get("/health")
-def health_check():
-    try:
-        db = SessionLocal()
-        db.execute(text("SELECT 1"))
-        return {
-            "status": "healthy",
-            "database": "connected",
-            "timestamp": time.time()
-        }
-    except Exception as e:
-        logger.error(f"Health check failed: {str(e)}")
-        raise HTTPException(
-            status_code=503,
-            detail="Service unhealthy - database connection failed"
+    logger.info("CORS configured for origins: %s", settings.allowed_origins)
+
+    # Metrics: request latency/counts, per-request SQL time, pool and cache gauges
+    _instrument_once()
+    app.add_middleware(MetricsMiddleware)
+
+    # Development: per-request statement counts in X-DB-Queries/X-DB-Time, N+1 warnings in the log
+    if query_recorder.QUERY_DEBUG:
+        query_recorder.install(engine)
+        query_recorder.install(async_engine.sync_engine)
+        app.add_middleware(query_recorder.QueryRecorderMiddleware)
+        logger.info("Query recorder enabled (budget %s statements per request)", query_recorder.QUERY_BUDGET)
+
+    # Structured request log, sampled for successful requests
+    app.add_middleware(RequestLogMiddleware, sample_rate=settings.log_sample_rate, slow_ms=settings.slow_request_ms)
+
+    # Global exception handler
+    @app.exception_handler(Exception)
+    async def global_exception_handler(request: Request, exc: Exception):
+        logger.error(f"Global error handler caught: {str(exc)}", exc_info=True)
+        return JSONResponse(
+            status_code=500,
+            content={"detail": "Internal server error"}
         )
-    finally:
-        db.close()
-
-# Include routers
-app.include_router(auth_router)
-app.include_router(user_router)
-app.include_router(task_router)
-app.include_router(project_router)
-app.include_router(inventory_router)
-app.include_router(inventory_transaction_router)
-app.include_router(inventory_item_router)
-app.include_router(financial_record_router)
-app.include_router(report_router)
-app.include_router(time_entry_router)
-app.include_router(accounting_router)
-app.include_router(reporting_router)
 
+    # Root endpoint
+    @app.get("/")
+    def root():
+        return {"message": "BizFlow backend is running"}
+
+    # CORS test endpoint
+    @app.get("/test-cors")
+    def test_cors():
+        return {"status": "success", "message": "CORS is working correctly"}
+
+    # Prometheus metrics endpoint
+    @app.get("/metrics", include_in_schema=False)
+    def metrics():
+        return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
+
+    # Health check endpoint
+    @app.get("/health")
+    def health_check():
+        try:
+            db = SessionLocal()
+            db.execute(text("SELECT 1"))
+            return {
+                "status": "healthy",
+                "database": "connected",
+                "timestamp": time.time()
+            }
+        except Exception as e:
+            logger.error(f"Health check failed: {str(e)}")
+            raise HTTPException(
+                status_code=503,
+                detail="Service unhealthy - database connection failed"
+            )
+        finally:
+            db.close()
+
+    # Include routers
+    for module_name, attribute in ROUTERS:
+        app.include_router(getattr(importlib.import_module(module_name), attribute))
+
+    return app
+
+
+def __getattr__(name: str):
+    # `uvicorn app.main:app` keeps working; the app is only built when first asked for
+    if name == "app":
+        global app
+        app = create_app()
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
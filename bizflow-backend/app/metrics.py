@@ -0,0 +1,245 @@
+"""In-process metrics exposed in the Prometheus text format at ``/metrics``.
+
+Collection is deliberately cheap: one ``perf_counter`` pair per request and
+per SQL statement, and a few dict updates under a lock. Pool and cache gauges
+are only read when the endpoint is scraped.
+"""
+
+from contextvars import ContextVar
+from threading import Lock
+from time import perf_counter
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import event
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+LabelValues = Tuple[str, ...]
+
+
+def _format_labels(names: Iterable[str], values: Iterable[str]) -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._values: Dict[LabelValues, float] = {}
+        self._lock = Lock()
+
+    def inc(self, labels: LabelValues = (), amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            items = list(self._values.items())
+        for labels, value in items:
+            lines.append(f"{self.name}{_format_labels(self.labelnames, labels)} {_format_number(value)}")
+        return lines
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, labels: LabelValues, value: float) -> None:
+        with self._lock:
+            self._values[labels] = value
+
+    def dec(self, labels: LabelValues = (), amount: float = 1) -> None:
+        self.inc(labels, -amount)
+
+
+class Histogram:
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = (), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.buckets = tuple(buckets) + (float("inf"),)
+        self._series: Dict[LabelValues, list] = {}
+        self._lock = Lock()
+
+    def observe(self, labels: LabelValues, value: float) -> None:
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                # [bucket counts..., sum, count]
+                series = self._series[labels] = [0] * len(self.buckets) + [0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+                    break
+            series[-2] += value
+            series[-1] += 1
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = [(labels, list(series)) for labels, series in self._series.items()]
+        for labels, series in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                bucket_labels = _format_labels(self.labelnames + ("le",), labels + (_format_number(bound),))
+                lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+            label_text = _format_labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{label_text} {series[-2]!r}")
+            lines.append(f"{self.name}_count{label_text} {series[-1]}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = []
+        self._collectors: List[Callable[[], List[str]]] = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def add_collector(self, collector: Callable[[], List[str]]) -> None:
+        """Register a callable producing extra exposition lines at scrape time."""
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        for collector in self._collectors:
+            lines.extend(collector())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+REQUESTS = registry.register(Counter(
+    "bizflow_http_requests_total", "HTTP requests handled.", ("method", "route", "status")))
+REQUEST_LATENCY = registry.register(Histogram(
+    "bizflow_http_request_duration_seconds", "HTTP request latency.", ("method", "route", "status")))
+IN_FLIGHT = registry.register(Gauge(
+    "bizflow_http_requests_in_flight", "HTTP requests currently being handled."))
+REQUEST_DB_TIME = registry.register(Histogram(
+    "bizflow_http_request_db_seconds", "Time spent executing SQL per request.", ("method", "route")))
+DB_QUERIES = registry.register(Counter(
+    "bizflow_db_queries_total", "SQL statements executed, by request route.", ("route",)))
+
+
+class RequestDBStats:
+    """SQL activity of the current request, filled in by the engine event hooks."""
+    __slots__ = ("queries", "seconds")
+
+    def __init__(self):
+        self.queries = 0
+        self.seconds = 0.0
+
+
+current_db_stats: ContextVar[Optional[RequestDBStats]] = ContextVar("current_db_stats", default=None)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context._metrics_started = perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = current_db_stats.get()
+    started = getattr(context, "_metrics_started", None)
+    if stats is None or started is None:
+        return
+    stats.queries += 1
+    stats.seconds += perf_counter() - started
+
+
+def instrument_engine(engine) -> None:
+    """Attach SQL timing hooks to a sync Engine (use ``async_engine.sync_engine`` for async ones)."""
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def pool_collector(engines: Dict[str, object]) -> Callable[[], List[str]]:
+    """Expose checkout/overflow gauges for each named engine's pool."""
+    def collect() -> List[str]:
+        gauges = (
+            ("bizflow_db_pool_size", "Configured pool size.", "size"),
+            ("bizflow_db_pool_checked_out", "Connections currently checked out of the pool.", "checkedout"),
+            ("bizflow_db_pool_overflow", "Connections opened beyond the pool size.", "overflow"),
+        )
+        lines = []
+        for metric, documentation, attribute in gauges:
+            lines.append(f"# HELP {metric} {documentation}")
+            lines.append(f"# TYPE {metric} gauge")
+            for label, engine in engines.items():
+                reader = getattr(engine.pool, attribute, None)
+                if reader is not None:
+                    lines.append(f'{metric}{{engine="{label}"}} {reader()}')
+        return lines
+    return collect
+
+
+def stats_collector(prefix: str, documentation: str, source: Callable[[], Dict]) -> Callable[[], List[str]]:
+    """Expose a ``{group: {stat: value}}`` or ``{stat: value}`` dict as gauges."""
+    def collect() -> List[str]:
+        lines = [f"# HELP {prefix} {documentation}", f"# TYPE {prefix} gauge"]
+        for key, value in source().items():
+            if isinstance(value, dict):
+                for stat, number in value.items():
+                    lines.append(f'{prefix}{{group="{key}",stat="{stat}"}} {number}')
+            else:
+                lines.append(f'{prefix}{{stat="{key}"}} {value}')
+        return lines
+    return collect
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording request counts, latency and per-request SQL time."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_holder = ["500"]
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status_holder[0] = str(message["status"])
+            await send(message)
+
+        stats = RequestDBStats()
+        token = current_db_stats.set(stats)
+        IN_FLIGHT.inc()
+        started = perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = perf_counter() - started
+            IN_FLIGHT.dec()
+            current_db_stats.reset(token)
+            # Label by route template, never by raw path, to keep cardinality bounded
+            route = getattr(scope.get("route"), "path", None) or "unmatched"
+            method = scope["method"]
+            labels = (method, route, status_holder[0])
+            REQUESTS.inc(labels)
+            REQUEST_LATENCY.observe(labels, elapsed)
+            REQUEST_DB_TIME.observe((method, route), stats.seconds)
+            if stats.queries:
+                DB_QUERIES.inc((route,), stats.queries)
@@ -1,11 +1,15 @@
 from app.models.user import User
-from app.models.task import Task
+from app.models.task import Task, TaskStatus, TaskPriority
 from app.models.project import Project
 from app.models.accounting import AccountingEntry
 from app.models.time_entry import TimeEntry
 from app.models.inventory import InventoryItem
 from app.models.inventory_transaction import InventoryTransaction
 from app.models.financial_record import FinancialRecord
+from app.models.project_task_counter import ProjectTaskCounter
+from app.models.daily_rollup import AccountingDailyRollup, FinancialDailyRollup
+from app.models.inventory_snapshot import InventorySnapshot
+from app.models.notification_outbox import NotificationOutbox
 
-__all__ = ["User", "Task", "Project", "AccountingEntry", "TimeEntry", "InventoryItem", "InventoryTransaction", "FinancialRecord"]
+__all__ = ["User", "Task", "TaskStatus", "TaskPriority", "Project", "AccountingEntry", "TimeEntry", "InventoryItem", "InventoryTransaction", "FinancialRecord", "ProjectTaskCounter", "AccountingDailyRollup", "FinancialDailyRollup", "InventorySnapshot", "NotificationOutbox"]
 
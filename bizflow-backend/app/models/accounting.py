@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Enum
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Enum, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.database import Base
@@ -12,12 +12,19 @@ class TransactionType(str, enum.Enum):
 
 class AccountingEntry(Base):
     __tablename__ = "accounting_entries"
+    __table_args__ = (
+        Index("ix_accounting_entries_timestamp_id", "timestamp", "id"),
+        # Cover the per-project / per-task summaries so they never touch the table
+        Index("ix_accounting_entries_project_id_type_amount", "project_id", "type", "amount"),
+        Index("ix_accounting_entries_task_id_type_amount", "task_id", "type", "amount"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     amount = Column(Float, nullable=False)
     type = Column(Enum(TransactionType), nullable=False)
     description = Column(String, nullable=True)
     timestamp = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     task_id = Column(Integer, ForeignKey("tasks.id"), nullable=True)
     project_id = Column(Integer, ForeignKey("projects.id"), nullable=True)
@@ -0,0 +1,116 @@
+from sqlalchemy import Column, Integer, Float, Date, DateTime, Enum, event, inspect
+from datetime import datetime
+from app.database import Base, increment_row
+from app.models.accounting import AccountingEntry, TransactionType
+from app.models.financial_record import FinancialRecord, RecordType
+
+# Primary key columns cannot be NULL, so entries without a project or task
+# roll up under this key and are reported back as None
+NO_KEY = 0
+
+
+class AccountingDailyRollup(Base):
+    """Per-day accounting totals, kept in step with every accounting entry write."""
+    __tablename__ = "accounting_daily_rollups"
+
+    day = Column(Date, primary_key=True)
+    project_key = Column(Integer, primary_key=True, default=NO_KEY)
+    task_key = Column(Integer, primary_key=True, default=NO_KEY)
+    type = Column(Enum(TransactionType), primary_key=True)
+    total = Column(Float, nullable=False, default=0)
+    entry_count = Column(Integer, nullable=False, default=0)
+    # Moves on every change, so the reports can stamp the rollup instead of the entries
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+
+class FinancialDailyRollup(Base):
+    """Per-day financial record totals, kept in step with every financial record write."""
+    __tablename__ = "financial_daily_rollups"
+
+    day = Column(Date, primary_key=True)
+    project_key = Column(Integer, primary_key=True, default=NO_KEY)
+    task_key = Column(Integer, primary_key=True, default=NO_KEY)
+    type = Column(Enum(RecordType), primary_key=True)
+    total = Column(Float, nullable=False, default=0)
+    entry_count = Column(Integer, nullable=False, default=0)
+    # Moves on every change, so the reports can stamp the rollup instead of the entries
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+
+# source model -> (rollup model, timestamp attribute)
+ROLLUPS = {
+    AccountingEntry: (AccountingDailyRollup, "timestamp"),
+    FinancialRecord: (FinancialDailyRollup, "created_at"),
+}
+
+
+def rollup_key(day_value, project_id, task_id, type_):
+    day = day_value.date() if hasattr(day_value, "date") else day_value
+    return (day, project_id or NO_KEY, task_id or NO_KEY, type_)
+
+
+def apply_rollup_deltas(connection, rollup, deltas):
+    """Apply {(day, project_key, task_key, type): (amount, count)} to ``rollup`` on ``connection``.
+
+    Runs inside the caller's transaction, so the rollups commit or roll back
+    together with the entries they summarize.
+    """
+    table = rollup.__table__
+    for (day, project_key, task_key, type_), (amount, count) in deltas.items():
+        if day is None or (not amount and not count):
+            continue
+        increment_row(
+            connection, table,
+            {"day": day, "project_key": project_key, "task_key": task_key, "type": type_},
+            {"total": amount, "entry_count": count},
+            {"updated_at": datetime.utcnow()},
+        )
+
+
+def rollup_deltas_for(source, rows, sign=1):
+    """Deltas for inserting (sign=1) or removing (sign=-1) ``rows`` of ``source``."""
+    timestamp_attr = ROLLUPS[source][1]
+    deltas = {}
+    for row in rows:
+        key = rollup_key(getattr(row, timestamp_attr), row.project_id, row.task_id, row.type)
+        amount, count = deltas.get(key, (0, 0))
+        deltas[key] = (amount + sign * row.amount, count + sign)
+    return deltas
+
+
+def _previous(state, key):
+    history = state.attrs[key].history
+    if history.deleted:
+        return history.deleted[0]
+    return getattr(state.object, key)
+
+
+def _register(source, rollup, timestamp_attr):
+    tracked = (timestamp_attr, "project_id", "task_id", "type", "amount")
+
+    @event.listens_for(source, "after_insert")
+    def _inserted(mapper, connection, target):
+        apply_rollup_deltas(connection, rollup, rollup_deltas_for(source, [target]))
+
+    @event.listens_for(source, "after_update")
+    def _updated(mapper, connection, target):
+        state = inspect(target)
+        if not any(state.attrs[name].history.has_changes() for name in tracked):
+            return
+        old_key = rollup_key(*(_previous(state, name) for name in tracked[:4]))
+        new_key = rollup_key(*(getattr(target, name) for name in tracked[:4]))
+        old_amount = _previous(state, "amount")
+        if old_key == new_key:
+            apply_rollup_deltas(connection, rollup, {new_key: (target.amount - old_amount, 0)})
+        else:
+            apply_rollup_deltas(connection, rollup, {old_key: (-old_amount, -1), new_key: (target.amount, 1)})
+
+    @event.listens_for(source, "after_delete")
+    def _deleted(mapper, connection, target):
+        state = inspect(target)
+        key = rollup_key(*(_previous(state, name) for name in tracked[:4]))
+        apply_rollup_deltas(connection, rollup, {key: (-_previous(state, "amount"), -1)})
+
+
+for _source, (_rollup, _timestamp_attr) in ROLLUPS.items():
+    _register(_source, _rollup, _timestamp_attr)
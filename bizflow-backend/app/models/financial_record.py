@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, Text, ForeignKey, Enum, DateTime
+from sqlalchemy import Column, Integer, String, Float, Text, ForeignKey, Enum, DateTime, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.database import Base
@@ -10,6 +10,10 @@ class RecordType(str, enum.Enum):
 
 class FinancialRecord(Base):
     __tablename__ = "financial_records"
+    __table_args__ = (
+        Index("ix_financial_records_created_at_id", "created_at", "id"),
+        Index("ix_financial_records_type_amount", "type", "amount"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     amount = Column(Float, nullable=False)
@@ -21,6 +25,7 @@ class FinancialRecord(Base):
     submitted_by = Column(Integer, ForeignKey("users.id"), nullable=False)
 
     created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     task = relationship("Task", back_populates="financial_records")
     project = relationship("Project", back_populates="financial_records")
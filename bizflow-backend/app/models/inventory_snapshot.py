@@ -0,0 +1,48 @@
+from sqlalchemy import Column, Integer, DateTime, ForeignKey, Index, event, func, inspect, insert, select
+from datetime import datetime
+from app.database import Base
+from app.models.inventory import InventoryItem
+from app.models.inventory_transaction import InventoryTransaction
+
+
+class InventorySnapshot(Base):
+    """An item's quantity at ``taken_at``, covering its ledger up to ``last_transaction_id``."""
+    __tablename__ = "inventory_snapshots"
+    __table_args__ = (
+        Index("ix_inventory_snapshots_item_id_taken_at", "item_id", "taken_at"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    item_id = Column(Integer, ForeignKey("inventory_items.id", ondelete="CASCADE"), nullable=False)
+    taken_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    quantity = Column(Integer, nullable=False)
+    last_transaction_id = Column(Integer, nullable=True)
+
+
+def last_transaction_id(item_id=None):
+    """Correlated subquery for the newest ledger row of an item (or of ``item_id``)."""
+    transactions = InventoryTransaction.__table__
+    owner = InventoryItem.__table__.c.id if item_id is None else item_id
+    return select(func.max(transactions.c.id)).where(transactions.c.item_id == owner).scalar_subquery()
+
+
+def _snapshot(connection, target):
+    connection.execute(insert(InventorySnapshot.__table__).values(
+        item_id=target.id,
+        taken_at=datetime.utcnow(),
+        quantity=target.quantity or 0,
+        last_transaction_id=last_transaction_id(target.id),
+    ))
+
+
+# Quantity set directly (on creation or by an edit) is not in the ledger, so
+# record it as a snapshot; replays never cross such a change without one
+@event.listens_for(InventoryItem, "after_insert")
+def _item_inserted(mapper, connection, target):
+    _snapshot(connection, target)
+
+
+@event.listens_for(InventoryItem, "after_update")
+def _item_updated(mapper, connection, target):
+    if inspect(target).attrs.quantity.history.has_changes():
+        _snapshot(connection, target)
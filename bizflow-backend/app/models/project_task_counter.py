@@ -0,0 +1,93 @@
+from sqlalchemy import Column, DateTime, Integer, ForeignKey, event, inspect, insert
+from datetime import datetime
+from app.database import Base, increment_row
+from app.models.project import Project
+from app.models.task import Task, TaskStatus
+
+
+class ProjectTaskCounter(Base):
+    """Per-project task counts by status, kept in step with every task write."""
+    __tablename__ = "project_task_counters"
+
+    project_id = Column(Integer, ForeignKey("projects.id"), primary_key=True)
+    total = Column(Integer, nullable=False, default=0)
+    todo = Column(Integer, nullable=False, default=0)
+    in_progress = Column(Integer, nullable=False, default=0)
+    done = Column(Integer, nullable=False, default=0)
+    # Moves on every change, so the progress endpoints can stamp this table instead of tasks
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+
+STATUS_COLUMNS = {
+    TaskStatus.todo: "todo",
+    TaskStatus.in_progress: "in_progress",
+    TaskStatus.done: "done",
+}
+
+
+def _status_column(status):
+    if status is None:
+        return None
+    return STATUS_COLUMNS.get(TaskStatus(status))
+
+
+def apply_counter_deltas(connection, deltas):
+    """Apply {(project_id, status): delta} to the counters on ``connection``.
+
+    Runs inside the caller's transaction, so the counters commit or roll back
+    together with the task rows they describe.
+    """
+    per_project = {}
+    for (project_id, status), delta in deltas.items():
+        if project_id is None or not delta:
+            continue
+        values = per_project.setdefault(project_id, {"total": 0})
+        values["total"] += delta
+        column = _status_column(status)
+        if column:
+            values[column] = values.get(column, 0) + delta
+
+    table = ProjectTaskCounter.__table__
+    for project_id, values in per_project.items():
+        increment_row(connection, table, {"project_id": project_id}, values, {"updated_at": datetime.utcnow()})
+
+
+def _previous(state, key):
+    history = state.attrs[key].history
+    if history.deleted:
+        return history.deleted[0]
+    return getattr(state.object, key)
+
+
+@event.listens_for(Task, "after_insert")
+def _task_inserted(mapper, connection, target):
+    apply_counter_deltas(connection, {(target.project_id, target.status): 1})
+
+
+@event.listens_for(Task, "after_update")
+def _task_updated(mapper, connection, target):
+    state = inspect(target)
+    if not (state.attrs.project_id.history.has_changes() or state.attrs.status.history.has_changes()):
+        return
+    old_key = (_previous(state, "project_id"), _previous(state, "status"))
+    new_key = (target.project_id, target.status)
+    if old_key != new_key:
+        apply_counter_deltas(connection, {old_key: -1, new_key: 1})
+
+
+@event.listens_for(Task, "after_delete")
+def _task_deleted(mapper, connection, target):
+    state = inspect(target)
+    apply_counter_deltas(connection, {(_previous(state, "project_id"), _previous(state, "status")): -1})
+
+
+@event.listens_for(Project, "after_insert")
+def _project_inserted(mapper, connection, target):
+    connection.execute(insert(ProjectTaskCounter.__table__).values(project_id=target.id))
+
+
+@event.listens_for(Project, "before_delete")
+def _project_deleted(mapper, connection, target):
+    # Before the project row goes, or the counter's foreign key would block the delete
+    table = ProjectTaskCounter.__table__
+    connection.execute(table.delete().where(table.c.project_id == target.id))
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Enum, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, DateTime, Enum, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.database import Base
@@ -20,6 +20,18 @@ class TaskPriority(str, enum.Enum):
 
 class Task(Base):
     __tablename__ = "tasks"
+    __table_args__ = (
+        Index("ix_tasks_created_at_id", "created_at", "id"),
+        Index("ix_tasks_project_id_status", "project_id", "status"),
+        Index("ix_tasks_assignee_id_status", "assignee_id", "status"),
+        Index("ix_tasks_status", "status"),
+        # Due-date ranges and the overdue filter; assignee views sorted by due date
+        Index("ix_tasks_due_date_status", "due_date", "status"),
+        Index("ix_tasks_assignee_id_due_date", "assignee_id", "due_date"),
+        Index("ix_tasks_priority_created_at", "priority", "created_at"),
+        # updated_since polling and sort=updated_at
+        Index("ix_tasks_updated_at_id", "updated_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(255), nullable=False)
@@ -1,10 +1,16 @@
-from sqlalchemy import Column, Integer, DateTime, ForeignKey, Text
+from sqlalchemy import Column, Integer, DateTime, ForeignKey, Text, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.database import Base
 
 class TimeEntry(Base):
     __tablename__ = "time_entries"
+    __table_args__ = (
+        # Serves the per-user listing, which pages on (start_time, id)
+        Index("ix_time_entries_user_id_start_time_id", "user_id", "start_time", "id"),
+        # All-user timesheets filter on the start_time range alone
+        Index("ix_time_entries_start_time", "start_time"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
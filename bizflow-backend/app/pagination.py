@@ -0,0 +1,180 @@
+"""Keyset (cursor) pagination shared by the list endpoints.
+
+A page is requested with an opaque ``cursor`` and a ``limit``. Rows are ordered
+by a fixed key such as ``(created_at, id)`` and the next page starts strictly
+after the last key returned, so every page costs one index range scan no
+matter how deep it is. The cursor for the following page is returned in the
+``X-Next-Cursor`` response header and is absent on the last page.
+
+Key columns may be descending (``column.desc()``); user-chosen orders are
+built with ``sort_keys``.
+"""
+
+from fastapi import HTTPException, Query, Response, status
+from sqlalchemy import and_, func, or_, select, tuple_
+from sqlalchemy.sql import operators
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import base64
+import json
+import os
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = int(os.getenv("MAX_PAGE_SIZE", "500"))
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+MAX_SORT_KEYS = 3
+TOTAL_COUNT_HEADER = "X-Total-Count"
+TOTAL_COUNT_CAPPED_HEADER = "X-Total-Count-Capped"
+# Counting stops here; larger totals are reported as the cap plus the capped header
+TOTAL_COUNT_CAP = int(os.getenv("TOTAL_COUNT_CAP", "10000"))
+
+
+def page_limit(default: int = DEFAULT_PAGE_SIZE):
+    return Query(default, ge=1, le=MAX_PAGE_SIZE, description=f"Page size (max {MAX_PAGE_SIZE})")
+
+
+def cursor_param():
+    return Query(None, description=f"Opaque cursor taken from the {NEXT_CURSOR_HEADER} header of the previous page")
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict) and "dt" in value:
+        return datetime.fromisoformat(value["dt"])
+    return value
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    raw = json.dumps([_encode_value(v) for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _matches_type(value: Any, column) -> bool:
+    try:
+        expected = _key_parts(column)[0].type.python_type
+    except NotImplementedError:
+        # Untyped expressions, e.g. a database function's result
+        return True
+    if isinstance(value, bool) and expected is not bool:
+        return False
+    if expected is float:
+        return isinstance(value, (int, float))
+    return isinstance(value, expected)
+
+
+def decode_cursor(cursor: str, key_columns: Sequence) -> List[Any]:
+    """Cursor values for ``key_columns``; anything malformed or of the wrong type is a 400."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(values, list) or len(values) != len(key_columns):
+            raise ValueError("cursor has the wrong shape")
+        values = [_decode_value(v) for v in values]
+        if not all(_matches_type(value, column) for value, column in zip(values, key_columns)):
+            raise ValueError("cursor value does not match its key column")
+        return values
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid pagination cursor")
+
+
+def sort_param(default: str, fields: Sequence[str]):
+    return Query(
+        default,
+        description=f"Comma-separated sort keys, prefix '-' for descending (up to {MAX_SORT_KEYS}): {', '.join(fields)}",
+    )
+
+
+def sort_keys(sort: str, columns: Dict[str, Any], tiebreaker) -> list:
+    """Key columns for a ``sort`` parameter such as ``-priority,due_date``.
+
+    ``columns`` maps sort names to non-null expressions. Every key is labeled
+    ``sort_<name>``, so it has to be added to the select (``add_columns``) for
+    ``finish_page`` to read the cursor values back from the rows.
+    ``tiebreaker`` (unique, ascending) makes the order total.
+    """
+    names = [token.strip() for token in sort.split(",") if token.strip()]
+    fields = [name.lstrip("-") for name in names]
+    unknown = [field for field in fields if field not in columns]
+    if unknown or len(set(fields)) != len(fields) or len(fields) > MAX_SORT_KEYS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid sort {sort!r}; use up to {MAX_SORT_KEYS} distinct keys of: {', '.join(columns)}",
+        )
+    keys = []
+    for name, field in zip(names, fields):
+        expression = columns[field].label(f"sort_{field}")
+        keys.append(expression.desc() if name.startswith("-") else expression)
+    keys.append(tiebreaker.label("sort_tiebreaker"))
+    return keys
+
+
+def key_expressions(key_columns: Sequence) -> list:
+    """The labeled expressions behind ``sort_keys`` output, for ``select(...).add_columns``."""
+    return [_key_parts(column)[0] for column in key_columns]
+
+
+def _key_parts(column) -> Tuple[Any, bool]:
+    """The expression behind a key column and whether it sorts descending."""
+    if getattr(column, "modifier", None) is operators.desc_op:
+        return column.element, True
+    return column, False
+
+
+def _after(key_columns: Sequence, values: Sequence[Any]):
+    parts = [_key_parts(column) for column in key_columns]
+    if not any(descending for _, descending in parts):
+        # Row value comparison: one index range scan
+        return tuple_(*(expression for expression, _ in parts)) > tuple_(*values)
+    # Mixed directions: (a > x) OR (a = x AND b < y) OR ...
+    return or_(*(
+        and_(
+            *(parts[j][0] == values[j] for j in range(i)),
+            expression < values[i] if descending else expression > values[i],
+        )
+        for i, (expression, descending) in enumerate(parts)
+    ))
+
+
+def keyset(query, key_columns: Sequence, cursor: Optional[str], limit: int):
+    """Order, filter and limit a Query or Select for one keyset page.
+
+    One extra row is fetched so that ``finish_page`` can tell whether another
+    page exists without a separate COUNT.
+    """
+    if cursor:
+        values = decode_cursor(cursor, key_columns)
+        query = query.where(_after(key_columns, values))
+    return query.order_by(*key_columns).limit(limit + 1)
+
+
+def finish_page(rows: Sequence, key_columns: Sequence, limit: int, response: Optional[Response] = None) -> Tuple[list, Optional[str]]:
+    """Trim the look-ahead row and build the cursor for the next page."""
+    rows = list(rows)
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor([getattr(last, _key_parts(column)[0].key) for column in key_columns])
+    if response is not None and next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return rows, next_cursor
+
+
+def capped_count(query, cap: int = TOTAL_COUNT_CAP):
+    """Scalar subquery counting the rows of ``query``, but no more than ``cap + 1`` of them.
+
+    Added as a column to the page query, the total arrives in the same round
+    trip, and a broad filter never costs more than ``cap`` index entries.
+    """
+    return select(func.count()).select_from(query.limit(cap + 1).subquery()).scalar_subquery()
+
+
+def set_total_count(response: Response, total: int, cap: int = TOTAL_COUNT_CAP) -> None:
+    response.headers[TOTAL_COUNT_HEADER] = str(min(total, cap))
+    if total > cap:
+        response.headers[TOTAL_COUNT_CAPPED_HEADER] = "true"
@@ -0,0 +1,124 @@
+"""Request-scoped SQL statement recording and N+1 detection.
+
+Every statement executed while a recorder is active is counted and grouped by
+its SQL text. SQLAlchemy renders parameters as placeholders, so a loop that
+lazy-loads one relationship per row shows up as the same statement shape
+executed many times.
+
+In development (``DB_QUERY_DEBUG``, on by default when ``DEVELOPMENT`` is
+true) ``QueryRecorderMiddleware`` records every request, adds ``X-DB-Queries``
+and ``X-DB-Time`` response headers and logs a warning when a request exceeds
+``DB_QUERY_BUDGET`` statements or repeats a shape ``N_PLUS_ONE_THRESHOLD``
+times. Tests use ``app.testing.assert_max_queries``.
+"""
+
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from time import perf_counter
+from typing import Dict, Iterator, Tuple
+import logging
+import os
+import re
+
+from sqlalchemy import event
+
+logger = logging.getLogger(__name__)
+
+QUERY_DEBUG = os.getenv("DB_QUERY_DEBUG", os.getenv("DEVELOPMENT", "true")).lower() == "true"
+QUERY_BUDGET = int(os.getenv("DB_QUERY_BUDGET", "20"))
+N_PLUS_ONE_THRESHOLD = int(os.getenv("N_PLUS_ONE_THRESHOLD", "5"))
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+class QueryRecorder:
+    """Collects the statements executed while it is active."""
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.shapes: Counter = Counter()
+
+    def record(self, statement: str, elapsed: float) -> None:
+        self.count += 1
+        self.seconds += elapsed
+        self.shapes[_WHITESPACE.sub(" ", statement).strip()] += 1
+
+    def repeated(self, threshold: int = N_PLUS_ONE_THRESHOLD) -> Dict[str, int]:
+        """Statement shapes executed at least ``threshold`` times."""
+        return {shape: n for shape, n in self.shapes.items() if n >= threshold}
+
+    def summary(self) -> str:
+        lines = [f"{self.count} statements in {self.seconds * 1000:.1f} ms"]
+        for shape, n in self.shapes.most_common():
+            lines.append(f"  {n}x {shape}")
+        return "\n".join(lines)
+
+
+# Recorders can nest (a test helper inside a recorded request), so keep a stack
+_active: ContextVar[Tuple[QueryRecorder, ...]] = ContextVar("active_query_recorders", default=())
+
+
+@contextmanager
+def record_queries() -> Iterator[QueryRecorder]:
+    recorder = QueryRecorder()
+    token = _active.set(_active.get() + (recorder,))
+    try:
+        yield recorder
+    finally:
+        _active.reset(token)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _active.get():
+        context._recorder_started = perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    recorders = _active.get()
+    started = getattr(context, "_recorder_started", None)
+    if not recorders or started is None:
+        return
+    elapsed = perf_counter() - started
+    for recorder in recorders:
+        recorder.record(statement, elapsed)
+
+
+def install(engine) -> None:
+    """Attach the recording hooks to a sync Engine (``async_engine.sync_engine`` for async)."""
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+class QueryRecorderMiddleware:
+    """Development middleware reporting per-request statement counts and N+1 suspects."""
+
+    def __init__(self, app, budget: int = QUERY_BUDGET, threshold: int = N_PLUS_ONE_THRESHOLD):
+        self.app = app
+        self.budget = budget
+        self.threshold = threshold
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with record_queries() as recorder:
+            async def send_wrapper(message):
+                if message["type"] == "http.response.start":
+                    headers = list(message.get("headers", []))
+                    headers.append((b"x-db-queries", str(recorder.count).encode()))
+                    headers.append((b"x-db-time", f"{recorder.seconds * 1000:.2f}ms".encode()))
+                    message = dict(message, headers=headers)
+                await send(message)
+
+            await self.app(scope, receive, send_wrapper)
+
+        route = getattr(scope.get("route"), "path", None) or scope["path"]
+        path = f"{scope['method']} {route}"
+        if recorder.count > self.budget:
+            logger.warning("%s executed %d SQL statements (budget %d)", path, recorder.count, self.budget)
+        for shape, n in recorder.repeated(self.threshold).items():
+            logger.warning("Possible N+1 in %s: statement ran %d times: %s", path, n, shape)
@@ -1,15 +1,21 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 
 from app import models, schemas, database
 from app.auth_utils import get_current_user
+from app.pagination import cursor_param, finish_page, keyset, page_limit
+from app.fast_json import json_list
+from app.bulk import bulk_body, insert_returning
+from app.models.daily_rollup import apply_rollup_deltas, rollup_deltas_for
 
 router = APIRouter(
     prefix="/accounting",
     tags=["Accounting"]
 )
 
+PAGE_KEY = (models.AccountingEntry.timestamp, models.AccountingEntry.id)
+
 @router.post("/", response_model=schemas.AccountingEntryOut, status_code=status.HTTP_201_CREATED)
 def create_entry(
     entry: schemas.AccountingEntryCreate,
@@ -30,27 +36,54 @@ def create_entry(
     return db_entry
 
 
+@router.post("/bulk", response_model=List[schemas.AccountingEntryOut], status_code=status.HTTP_201_CREATED)
+def create_entries_bulk(
+    entries: List[schemas.AccountingEntryCreate] = bulk_body(),
+    db: Session = Depends(database.get_db),
+    current_user: models.User = Depends(get_current_user)
+):
+    rows = [dict(entry.model_dump(), user_id=current_user.id) for entry in entries]
+    created = insert_returning(db, models.AccountingEntry, rows)
+    apply_rollup_deltas(db.connection(), models.AccountingDailyRollup, rollup_deltas_for(models.AccountingEntry, created))
+    db.commit()
+    return created
+
+
 @router.get("/", response_model=List[schemas.AccountingEntryOut])
 def get_entries(
+    response: Response,
+    cursor: Optional[str] = cursor_param(),
+    limit: int = page_limit(),
     db: Session = Depends(database.get_db),
     current_user: models.User = Depends(get_current_user)
 ):
-    return db.query(models.AccountingEntry).all()
+    rows = keyset(db.query(models.AccountingEntry), PAGE_KEY, cursor, limit).all()
+    return json_list(schemas.AccountingEntryOut, finish_page(rows, PAGE_KEY, limit, response)[0], response)
 
 
 @router.get("/by-task/{task_id}", response_model=List[schemas.AccountingEntryOut])
 def get_entries_by_task(
     task_id: int,
+    response: Response,
+    cursor: Optional[str] = cursor_param(),
+    limit: int = page_limit(),
     db: Session = Depends(database.get_db),
     current_user: models.User = Depends(get_current_user)
 ):
-    return db.query(models.AccountingEntry).filter(models.AccountingEntry.task_id == task_id).all()
+    query = db.query(models.AccountingEntry).filter(models.AccountingEntry.task_id == task_id)
+    rows = keyset(query, PAGE_KEY, cursor, limit).all()
+    return json_list(schemas.AccountingEntryOut, finish_page(rows, PAGE_KEY, limit, response)[0], response)
 
 
 @router.get("/by-project/{project_id}", response_model=List[schemas.AccountingEntryOut])
 def get_entries_by_project(
     project_id: int,
+    response: Response,
+    cursor: Optional[str] = cursor_param(),
+    limit: int = page_limit(),
     db: Session = Depends(database.get_db),
     current_user: models.User = Depends(get_current_user)
 ):
-    return db.query(models.AccountingEntry).filter(models.AccountingEntry.project_id == project_id).all()
+    query = db.query(models.AccountingEntry).filter(models.AccountingEntry.project_id == project_id)
+    rows = keyset(query, PAGE_KEY, cursor, limit).all()
+    return json_list(schemas.AccountingEntryOut, finish_page(rows, PAGE_KEY, limit, response)[0], response)
@@ -1,8 +1,10 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from fastapi.security import OAuth2PasswordRequestForm
+from starlette.concurrency import run_in_threadpool
 from app import models, schemas, database, utils
 from app.auth_utils import create_access_token
+from app.services import password_hashing
 import logging
 from typing import Dict
 from datetime import datetime
@@ -15,6 +17,13 @@ router = APIRouter(
     tags=["Authentication"]
 )
 
+def _get_user_by_email(db: Session, email: str):
+    return db.query(models.User).filter(models.User.email == email).first()
+
+def _store_password_hash(db: Session, user: models.User, hashed_password: str) -> None:
+    user.hashed_password = hashed_password
+    db.commit()
+
 @router.post("/login", response_model=schemas.Token)
 async def login(
     user_credentials: OAuth2PasswordRequestForm = Depends(),
@@ -35,10 +44,10 @@ async def login(
     """
     try:
         # Find user by email
-        user = db.query(models.User).filter(models.User.email == user_credentials.username).first()
+        user = await run_in_threadpool(_get_user_by_email, db, user_credentials.username)
         
         if not user:
-            logger.warning(f"Login attempt failed: User not found - {user_credentials.username}")
+            logger.warning("Login attempt failed: User not found - %s", user_credentials.username)
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid credentials",
@@ -46,13 +55,22 @@ async def login(
             )
         
         # Verify password
-        if not utils.verify_password(user_credentials.password, user.hashed_password):
-            logger.warning(f"Login attempt failed: Invalid password for user - {user_credentials.username}")
+        if not await password_hashing.verify_password(user_credentials.password, user.hashed_password):
+            logger.warning("Login attempt failed: Invalid password for user - %s", user_credentials.username)
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid credentials",
                 headers={"WWW-Authenticate": "Bearer"},
             )
+
+        # Transparently upgrade hashes made with outdated parameters
+        if utils.password_needs_rehash(user.hashed_password):
+            try:
+                new_hash = await password_hashing.hash_password(user_credentials.password)
+                await run_in_threadpool(_store_password_hash, db, user, new_hash)
+            except Exception as e:
+                await run_in_threadpool(db.rollback)
+                logger.warning("Could not rehash password for user %s: %s", user.email, e)
         
         # Create access token
         access_token = create_access_token(
@@ -64,13 +82,22 @@ async def login(
             }
         )
         
-        logger.info(f"User logged in successfully: {user.email}")
+        logger.debug("User logged in successfully: %s", user.email)
         return {
             "access_token": access_token,
             "token_type": "bearer",
             "expires_in": utils.ACCESS_TOKEN_EXPIRE_MINUTES * 60
         }
         
+    except password_hashing.HashingPoolSaturated:
+        logger.warning("Login rejected: password hashing pool is saturated")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Server is busy, please retry shortly",
+            headers={"Retry-After": "1"},
+        )
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Login error: {str(e)}")
         raise HTTPException(
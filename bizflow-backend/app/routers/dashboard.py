@@ -0,0 +1,142 @@
+"""Everything the dashboard page shows, in one request.
+
+The independent aggregates run concurrently, each on its own session (and
+so its own pooled connection), and the encoded payload is cached per user
+for a few seconds so reloads and tab switches cost nothing. Concurrent misses
+for one user share a single build, and all builds together hold at most
+``DASHBOARD_MAX_CONNECTIONS`` connections so the other endpoints keep theirs.
+"""
+
+from fastapi import APIRouter, Depends, Response
+from pydantic import TypeAdapter
+from sqlalchemy import case, func, select
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import Dict
+import asyncio
+import os
+
+from app import models, schemas, database
+from app.auth_utils import get_current_user
+from app.routers.project import progress_query, progress_row
+from app.routers.report import financial_summary, task_status_count
+from app.services.cache import TTLCache
+
+router = APIRouter(
+    prefix="/dashboard",
+    tags=["Dashboard"]
+)
+
+DASHBOARD_CACHE_TTL = float(os.getenv("DASHBOARD_CACHE_TTL", "15"))
+DASHBOARD_CACHE_MAXSIZE = int(os.getenv("DASHBOARD_CACHE_MAXSIZE", "1024"))
+DASHBOARD_PROJECTS = 10
+DASHBOARD_LOW_STOCK = 10
+DASHBOARD_RECENT_TASKS = 5
+# Defaults to half the pool: a burst of misses can slow the dashboard, not starve everything else
+DASHBOARD_MAX_CONNECTIONS = int(os.getenv("DASHBOARD_MAX_CONNECTIONS", str(max(1, database.POOL_SIZE // 2))))
+
+# Encoded payloads keyed by user id
+dashboard_cache = TTLCache(maxsize=DASHBOARD_CACHE_MAXSIZE, ttl=DASHBOARD_CACHE_TTL)
+
+_payload = TypeAdapter(schemas.DashboardOut)
+
+_connections = asyncio.Semaphore(DASHBOARD_MAX_CONNECTIONS)
+
+# user id -> build in progress, awaited by every concurrent miss for that user
+_inflight: Dict[int, asyncio.Task] = {}
+
+
+def get_dashboard_cache_stats() -> Dict[str, int]:
+    return dashboard_cache.stats()
+
+
+@asynccontextmanager
+async def _session():
+    async with _connections:
+        async with database.AsyncSessionLocal() as db:
+            yield db
+
+
+async def _finance() -> dict:
+    async with _session() as db:
+        return {"financial": await financial_summary(db)}
+
+
+async def _tasks(user_id: int) -> dict:
+    Task = models.Task
+    not_done = Task.status != models.TaskStatus.done
+    async with _session() as db:
+        task_status = await task_status_count(db)
+        counts = (await db.execute(select(
+            func.count(case((not_done & (Task.due_date < datetime.utcnow()), 1))),
+            func.count(case((not_done & (Task.assignee_id == user_id), 1))),
+        ))).one()
+    return {"task_status": task_status, "overdue_tasks": counts[0], "my_open_tasks": counts[1]}
+
+
+async def _projects() -> dict:
+    async with _session() as db:
+        total = await db.scalar(select(func.count(models.Project.id)))
+        result = await db.execute(
+            progress_query().order_by(models.Project.created_at.desc(), models.Project.id.desc()).limit(DASHBOARD_PROJECTS)
+        )
+        projects = [progress_row(row) for row in result.all()]
+    return {"total_projects": total, "projects": projects}
+
+
+async def _low_stock() -> dict:
+    Item = models.InventoryItem
+    low = Item.quantity <= Item.low_stock_threshold
+    async with _session() as db:
+        count = await db.scalar(select(func.count(Item.id)).where(low))
+        result = await db.execute(
+            select(Item.id, Item.name, Item.sku, Item.quantity, Item.low_stock_threshold)
+            .where(low).order_by(Item.quantity, Item.id).limit(DASHBOARD_LOW_STOCK)
+        )
+        items = [row._asdict() for row in result.all()]
+    return {"low_stock_count": count, "low_stock": items}
+
+
+async def _recent_tasks() -> dict:
+    Task = models.Task
+    async with _session() as db:
+        result = await db.execute(
+            select(Task.id, Task.title, Task.status, Task.priority, Task.due_date)
+            .order_by(Task.updated_at.desc(), Task.id.desc()).limit(DASHBOARD_RECENT_TASKS)
+        )
+        tasks = [row._asdict() for row in result.all()]
+    return {"recent_tasks": tasks}
+
+
+async def build_dashboard(user_id: int) -> bytes:
+    """Run every aggregate concurrently and encode the combined payload."""
+    parts = await asyncio.gather(_finance(), _tasks(user_id), _projects(), _low_stock(), _recent_tasks())
+    payload = {"generated_at": datetime.utcnow()}
+    for part in parts:
+        payload.update(part)
+    return _payload.dump_json(_payload.validate_python(payload))
+
+
+async def _refresh(user_id: int) -> bytes:
+    body = await build_dashboard(user_id)
+    dashboard_cache.set(user_id, body)
+    return body
+
+
+async def dashboard_body(user_id: int) -> bytes:
+    """The cached payload for ``user_id``, building it at most once at a time."""
+    body = dashboard_cache.get(user_id)
+    if body is not None:
+        return body
+    task = _inflight.get(user_id)
+    if task is None:
+        task = asyncio.ensure_future(_refresh(user_id))
+        _inflight[user_id] = task
+        task.add_done_callback(lambda _: _inflight.pop(user_id, None))
+    # A client that disconnects must not cancel the build others are waiting on
+    return await asyncio.shield(task)
+
+
+@router.get("/", response_model=schemas.DashboardOut)
+async def get_dashboard(current_user: models.User = Depends(get_current_user)):
+    return Response(content=await dashboard_body(current_user.id), media_type="application/json")
@@ -0,0 +1,100 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from typing import Iterator, Optional
+from datetime import datetime
+from enum import Enum
+import csv
+import io
+import json
+
+from app import models, database
+from app.auth_utils import get_current_user
+
+router = APIRouter(
+    prefix="/export",
+    tags=["Export"]
+)
+
+# Rows are fetched from a server-side cursor in chunks of this size
+EXPORT_CHUNK_SIZE = 1000
+
+# entity name -> (model, time column used for date filters, supports project filter,
+#                 owner column limiting non-admins to their own rows)
+EXPORTABLE = {
+    "inventory_transactions": (models.InventoryTransaction, "timestamp", False, None),
+    "accounting_entries": (models.AccountingEntry, "timestamp", True, None),
+    "financial_records": (models.FinancialRecord, "created_at", True, None),
+    "time_entries": (models.TimeEntry, "start_time", True, "user_id"),
+}
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+def _plain(value):
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def _ndjson_chunk(columns, rows) -> bytes:
+    lines = [json.dumps(dict(zip(columns, map(_plain, row))), separators=(",", ":")) for row in rows]
+    return ("\n".join(lines) + "\n").encode()
+
+
+def _csv_chunk(rows) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerows(["" if value is None else _plain(value) for value in row] for row in rows)
+    return buffer.getvalue().encode()
+
+
+def _stream_rows(stmt, columns, fmt: str) -> Iterator[bytes]:
+    # The connection is opened and released inside the generator so it lives
+    # exactly as long as the response body is being sent.
+    with database.engine.connect() as conn:
+        result = conn.execution_options(stream_results=True, yield_per=EXPORT_CHUNK_SIZE).execute(stmt)
+        if fmt == "csv":
+            yield _csv_chunk([columns])
+        for rows in result.partitions():
+            yield _ndjson_chunk(columns, rows) if fmt == "ndjson" else _csv_chunk(rows)
+
+
+@router.get("/{entity}")
+async def export_entity(
+    entity: str,
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    start: Optional[datetime] = Query(None, description="Include rows at or after this time"),
+    end: Optional[datetime] = Query(None, description="Include rows before this time"),
+    project_id: Optional[int] = None,
+    current_user: models.User = Depends(get_current_user)
+):
+    if entity not in EXPORTABLE:
+        raise HTTPException(status_code=404, detail=f"Unknown export entity. Choose one of: {', '.join(EXPORTABLE)}")
+    model, time_column, has_project, owner_column = EXPORTABLE[entity]
+    if project_id is not None and not has_project:
+        raise HTTPException(status_code=400, detail=f"{entity} cannot be filtered by project")
+
+    table = model.__table__
+    columns = [column.name for column in table.columns]
+    stmt = select(*table.columns)
+    if owner_column is not None and current_user.role != "admin":
+        stmt = stmt.where(table.c[owner_column] == current_user.id)
+    if start is not None:
+        stmt = stmt.where(table.c[time_column] >= start)
+    if end is not None:
+        stmt = stmt.where(table.c[time_column] < end)
+    if project_id is not None:
+        stmt = stmt.where(table.c.project_id == project_id)
+    stmt = stmt.order_by(table.c[time_column], table.c.id)
+
+    return StreamingResponse(
+        _stream_rows(stmt, columns, format),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{entity}.{format}"'}
+    )
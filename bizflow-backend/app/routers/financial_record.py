@@ -1,14 +1,18 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from app import models, schemas, database
 from app.auth_utils import get_current_user
+from app.pagination import cursor_param, finish_page, keyset, page_limit
+from app.fast_json import json_list
 
 router = APIRouter(
     prefix="/financial-records",
     tags=["Financial Records"]
 )
 
+PAGE_KEY = (models.FinancialRecord.created_at, models.FinancialRecord.id)
+
 @router.post("/", response_model=schemas.FinancialRecordOut, status_code=status.HTTP_201_CREATED)
 def create_record(
     record: schemas.FinancialRecordCreate,
@@ -23,7 +27,11 @@ def create_record(
 
 @router.get("/", response_model=List[schemas.FinancialRecordOut])
 def get_records(
+    response: Response,
+    cursor: Optional[str] = cursor_param(),
+    limit: int = page_limit(),
     db: Session = Depends(database.get_db),
     current_user: models.User = Depends(get_current_user)
 ):
-    return db.query(models.FinancialRecord).all()
+    rows = keyset(db.query(models.FinancialRecord), PAGE_KEY, cursor, limit).all()
+    return json_list(schemas.FinancialRecordOut, finish_page(rows, PAGE_KEY, limit, response)[0], response)
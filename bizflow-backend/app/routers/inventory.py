@@ -1,14 +1,32 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
+from datetime import datetime
 from app import models, schemas, database
 from app.auth_utils import get_current_user
+from app.pagination import cursor_param, finish_page, keyset, page_limit
+from app.fast_json import json_list, json_one
+from app.sparse_fields import fields_param, sparse_fields
+from app.conditional import check_stamps, check_validators, table_stamp
+from app.services.inventory_snapshots import as_utc_naive, stock_at
 
 router = APIRouter(
     prefix="/inventory",
     tags=["Inventory"]
 )
 
+PAGE_KEY = (models.InventoryItem.created_at, models.InventoryItem.id)
+
+
+def ts_param():
+    return Query(..., description="Point in time; treated as UTC when it has no offset")
+
+
+def _stock_level(item, quantity, ts):
+    return {"item_id": item.id, "sku": item.sku, "name": item.name, "quantity": quantity, "ts": ts}
+
 @router.post("/", response_model=schemas.InventoryOut, status_code=status.HTTP_201_CREATED)
 def create_item(item: schemas.InventoryCreate, db: Session = Depends(database.get_db), current_user: models.User = Depends(get_current_user)):
     existing = db.query(models.InventoryItem).filter(models.InventoryItem.sku == item.sku).first()
@@ -21,19 +39,65 @@ def create_item(item: schemas.InventoryCreate, db: Session = Depends(database.ge
     return new_item
 
 @router.get("/", response_model=List[schemas.InventoryOut])
-def list_items(db: Session = Depends(database.get_db), current_user: models.User = Depends(get_current_user)):
-    return db.query(models.InventoryItem).all()
+async def list_items(request: Request, response: Response, cursor: Optional[str] = cursor_param(), limit: int = page_limit(), fields: Optional[str] = fields_param(), db: AsyncSession = Depends(database.get_async_db), current_user: models.User = Depends(get_current_user)):
+    fieldset = sparse_fields(schemas.InventoryOut, models.InventoryItem, fields, PAGE_KEY)
+    not_modified = await check_stamps(request, response, db, table_stamp(models.InventoryItem))
+    if not_modified is not None:
+        return not_modified
+    result = await db.execute(keyset(select(models.InventoryItem).options(*fieldset.options), PAGE_KEY, cursor, limit))
+    return json_list(fieldset.schema, finish_page(result.scalars().all(), PAGE_KEY, limit, response)[0], response)
 
 @router.get("/low-stock", response_model=List[schemas.InventoryOut])
-def low_stock_items(db: Session = Depends(database.get_db), current_user: models.User = Depends(get_current_user)):
-    return db.query(models.InventoryItem).filter(models.InventoryItem.quantity <= models.InventoryItem.low_stock_threshold).all()
+async def low_stock_items(request: Request, response: Response, cursor: Optional[str] = cursor_param(), limit: int = page_limit(), fields: Optional[str] = fields_param(), db: AsyncSession = Depends(database.get_async_db), current_user: models.User = Depends(get_current_user)):
+    fieldset = sparse_fields(schemas.InventoryOut, models.InventoryItem, fields, PAGE_KEY)
+    low = models.InventoryItem.quantity <= models.InventoryItem.low_stock_threshold
+    not_modified = await check_stamps(request, response, db, table_stamp(models.InventoryItem, low))
+    if not_modified is not None:
+        return not_modified
+    query = select(models.InventoryItem).where(low).options(*fieldset.options)
+    result = await db.execute(keyset(query, PAGE_KEY, cursor, limit))
+    return json_list(fieldset.schema, finish_page(result.scalars().all(), PAGE_KEY, limit, response)[0], response)
+
+@router.get("/stock-at", response_model=List[schemas.StockAtOut])
+async def stock_at_all_items(request: Request, response: Response, ts: datetime = ts_param(), cursor: Optional[str] = cursor_param(), limit: int = page_limit(), db: AsyncSession = Depends(database.get_async_db), current_user: models.User = Depends(get_current_user)):
+    ts = as_utc_naive(ts)
+    not_modified = await check_stamps(
+        request, response, db,
+        table_stamp(models.InventoryItem, models.InventoryItem.created_at <= ts),
+        table_stamp(models.InventoryTransaction),
+    )
+    if not_modified is not None:
+        return not_modified
+    query = select(models.InventoryItem).where(models.InventoryItem.created_at <= ts)
+    result = await db.execute(keyset(query, PAGE_KEY, cursor, limit))
+    items = finish_page(result.scalars().all(), PAGE_KEY, limit, response)[0]
+    levels = await db.run_sync(lambda session: stock_at(session, ts, [item.id for item in items]))
+    return [_stock_level(item, levels.get(item.id, 0), ts) for item in items]
+
+@router.get("/{item_id}/stock-at", response_model=schemas.StockAtOut)
+async def item_stock_at(item_id: int, request: Request, response: Response, ts: datetime = ts_param(), db: AsyncSession = Depends(database.get_async_db), current_user: models.User = Depends(get_current_user)):
+    item = await db.get(models.InventoryItem, item_id)
+    if not item:
+        raise HTTPException(status_code=404, detail="Item not found")
+    ts = as_utc_naive(ts)
+    not_modified = await check_stamps(
+        request, response, db,
+        table_stamp(models.InventoryItem, models.InventoryItem.id == item_id),
+        table_stamp(models.InventoryTransaction, models.InventoryTransaction.item_id == item_id),
+    )
+    if not_modified is not None:
+        return not_modified
+    levels = await db.run_sync(lambda session: stock_at(session, ts, [item_id]))
+    # An item that did not exist yet had nothing on hand
+    return _stock_level(item, levels.get(item_id, 0), ts)
 
 @router.get("/{item_id}", response_model=schemas.InventoryOut)
-def get_item(item_id: int, db: Session = Depends(database.get_db), current_user: models.User = Depends(get_current_user)):
-    item = db.query(models.InventoryItem).filter(models.InventoryItem.id == item_id).first()
+async def get_item(item_id: int, request: Request, response: Response, fields: Optional[str] = fields_param(), db: AsyncSession = Depends(database.get_async_db), current_user: models.User = Depends(get_current_user)):
+    fieldset = sparse_fields(schemas.InventoryOut, models.InventoryItem, fields, [models.InventoryItem.updated_at])
+    item = await db.get(models.InventoryItem, item_id, options=fieldset.options)
     if not item:
         raise HTTPException(status_code=404, detail="Item not found")
-    return item
+    return check_validators(request, response, [item.updated_at], item.updated_at) or json_one(fieldset.schema, item, response)
 
 @router.put("/{item_id}", response_model=schemas.InventoryOut)
 def update_item(item_id: int, updates: schemas.InventoryUpdate, db: Session = Depends(database.get_db), current_user: models.User = Depends(get_current_user)):
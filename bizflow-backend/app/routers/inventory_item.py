@@ -1,15 +1,20 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 
 from app import models, schemas, database
 from app.auth_utils import get_current_user
+from app.pagination import cursor_param, finish_page, keyset, page_limit
+from app.fast_json import json_list, json_one
+from app.sparse_fields import fields_param, sparse_fields
 
 router = APIRouter(
     prefix="/inventory-items",
     tags=["Inventory Items"]
 )
 
+PAGE_KEY = (models.InventoryItem.created_at, models.InventoryItem.id)
+
 @router.post("/", response_model=schemas.InventoryOut, status_code=status.HTTP_201_CREATED)
 def create_inventory_item(item: schemas.InventoryCreate, db: Session = Depends(database.get_db), current_user: models.User = Depends(get_current_user)):
     new_item = models.InventoryItem(**item.model_dump())
@@ -19,15 +24,18 @@ def create_inventory_item(item: schemas.InventoryCreate, db: Session = Depends(d
     return new_item
 
 @router.get("/", response_model=List[schemas.InventoryOut])
-def get_all_inventory_items(db: Session = Depends(database.get_db), current_user: models.User = Depends(get_current_user)):
-    return db.query(models.InventoryItem).all()
+def get_all_inventory_items(response: Response, cursor: Optional[str] = cursor_param(), limit: int = page_limit(), fields: Optional[str] = fields_param(), db: Session = Depends(database.get_db), current_user: models.User = Depends(get_current_user)):
+    fieldset = sparse_fields(schemas.InventoryOut, models.InventoryItem, fields, PAGE_KEY)
+    rows = keyset(db.query(models.InventoryItem).options(*fieldset.options), PAGE_KEY, cursor, limit).all()
+    return json_list(fieldset.schema, finish_page(rows, PAGE_KEY, limit, response)[0], response)
 
 @router.get("/{item_id}", response_model=schemas.InventoryOut)
-def get_inventory_item(item_id: int, db: Session = Depends(database.get_db), current_user: models.User = Depends(get_current_user)):
-    item = db.query(models.InventoryItem).filter(models.InventoryItem.id == item_id).first()
+def get_inventory_item(item_id: int, fields: Optional[str] = fields_param(), db: Session = Depends(database.get_db), current_user: models.User = Depends(get_current_user)):
+    fieldset = sparse_fields(schemas.InventoryOut, models.InventoryItem, fields)
+    item = db.query(models.InventoryItem).options(*fieldset.options).filter(models.InventoryItem.id == item_id).first()
     if not item:
         raise HTTPException(status_code=404, detail="Item not found")
-    return item
+    return json_one(fieldset.schema, item)
 
 @router.put("/{item_id}", response_model=schemas.InventoryOut)
 def update_inventory_item(item_id: int, item_update: schemas.InventoryUpdate, db: Session = Depends(database.get_db), current_user: models.User = Depends(get_current_user)):
@@ -1,32 +1,45 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy import case, select, update
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
+from collections import defaultdict
+from datetime import datetime
 
 from app import models, schemas, database
 from app.auth_utils import get_current_user
+from app.pagination import cursor_param, finish_page, keyset, page_limit
+from app.fast_json import json_list
+from app.bulk import bulk_body, insert_returning
 
 router = APIRouter(
     prefix="/inventory/transactions",
     tags=["Inventory Transactions"]
 )
 
+PAGE_KEY = (models.InventoryTransaction.timestamp, models.InventoryTransaction.id)
+
 @router.post("/", response_model=schemas.InventoryTransactionOut, status_code=status.HTTP_201_CREATED)
 def create_transaction(
     tx: schemas.InventoryTransactionCreate,
     db: Session = Depends(database.get_db),
     current_user: models.User = Depends(get_current_user)
 ):
-    item = db.query(models.InventoryItem).filter(models.InventoryItem.id == tx.item_id).first()
-    if not item:
-        raise HTTPException(status_code=404, detail="Item not found")
-
-    # ✅ Prevent negative inventory
-    if item.quantity + tx.quantity_change < 0:
+    # One conditional UPDATE both checks and applies the change: concurrent picks
+    # cannot lose updates or drive stock negative, and no read lock is held
+    items = models.InventoryItem.__table__
+    new_quantity = db.execute(
+        update(items)
+        .where(items.c.id == tx.item_id, items.c.quantity + tx.quantity_change >= 0)
+        .values(quantity=items.c.quantity + tx.quantity_change)
+        .returning(items.c.quantity)
+    ).scalar_one_or_none()
+    if new_quantity is None:
+        exists = db.execute(select(items.c.id).where(items.c.id == tx.item_id)).first() is not None
+        db.rollback()
+        if not exists:
+            raise HTTPException(status_code=404, detail="Item not found")
         raise HTTPException(status_code=400, detail="Insufficient stock for this transaction")
 
-    # ✅ Apply inventory update
-    item.quantity += tx.quantity_change
-
     transaction = models.InventoryTransaction(
         item_id=tx.item_id,
         quantity_change=tx.quantity_change,
@@ -40,17 +53,58 @@ def create_transaction(
     db.refresh(transaction)
     return transaction
 
+@router.post("/bulk", response_model=List[schemas.InventoryTransactionOut], status_code=status.HTTP_201_CREATED)
+def create_transactions_bulk(
+    transactions: List[schemas.InventoryTransactionCreate] = bulk_body(),
+    db: Session = Depends(database.get_db),
+    current_user: models.User = Depends(get_current_user)
+):
+    deltas = defaultdict(int)
+    for tx in transactions:
+        deltas[tx.item_id] += tx.quantity_change
+
+    items = models.InventoryItem.__table__
+    found = set(db.execute(select(items.c.id).where(items.c.id.in_(deltas))).scalars())
+    missing = sorted(set(deltas) - found)
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Items not found: {missing}")
+
+    # One statement applies the net change per item, refusing any that would go negative
+    delta = case(deltas, value=items.c.id)
+    result = db.execute(
+        update(items)
+        .where(items.c.id.in_(deltas), items.c.quantity + delta >= 0)
+        .values(quantity=items.c.quantity + delta, updated_at=datetime.utcnow())
+    )
+    if result.rowcount != len(deltas):
+        db.rollback()
+        raise HTTPException(status_code=400, detail="Insufficient stock for one or more items in this batch")
+
+    rows = [dict(tx.model_dump(), performed_by=current_user.id) for tx in transactions]
+    created = insert_returning(db, models.InventoryTransaction, rows)
+    db.commit()
+    return created
+
 @router.get("/", response_model=List[schemas.InventoryTransactionOut])
 def get_all_transactions(
+    response: Response,
+    cursor: Optional[str] = cursor_param(),
+    limit: int = page_limit(),
     db: Session = Depends(database.get_db),
     current_user: models.User = Depends(get_current_user)
 ):
-    return db.query(models.InventoryTransaction).all()
+    rows = keyset(db.query(models.InventoryTransaction), PAGE_KEY, cursor, limit).all()
+    return json_list(schemas.InventoryTransactionOut, finish_page(rows, PAGE_KEY, limit, response)[0], response)
 
 @router.get("/{item_id}", response_model=List[schemas.InventoryTransactionOut])
 def get_transactions_for_item(
     item_id: int,
+    response: Response,
+    cursor: Optional[str] = cursor_param(),
+    limit: int = page_limit(),
     db: Session = Depends(database.get_db),
     current_user: models.User = Depends(get_current_user)
 ):
-    return db.query(models.InventoryTransaction).filter(models.InventoryTransaction.item_id == item_id).all()
+    query = db.query(models.InventoryTransaction).filter(models.InventoryTransaction.item_id == item_id)
+    rows = keyset(query, PAGE_KEY, cursor, limit).all()
+    return json_list(schemas.InventoryTransactionOut, finish_page(rows, PAGE_KEY, limit, response)[0], response)
@@ -1,17 +1,55 @@
 # app/routers/project.py
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 
 from app import models, schemas, database
 from app.auth_utils import get_current_user
+from app.pagination import cursor_param, finish_page, keyset, page_limit
+from app.fast_json import json_list, json_one
+from app.sparse_fields import fields_param, sparse_fields
+from app.conditional import check_stamps, check_validators, table_stamp
 
 router = APIRouter(
     prefix="/projects",
     tags=["Projects"]
 )
 
+PAGE_KEY = (models.Project.created_at, models.Project.id)
+TASK_PAGE_KEY = (models.Task.created_at, models.Task.id)
+
+
+def progress_query():
+    """Project progress straight from the maintained counters: one indexed join."""
+    counter = models.ProjectTaskCounter
+    return (
+        select(
+            models.Project.id,
+            models.Project.name,
+            func.coalesce(counter.total, 0).label("total"),
+            func.coalesce(counter.done, 0).label("done"),
+            func.coalesce(counter.in_progress, 0).label("in_progress"),
+            func.coalesce(counter.todo, 0).label("todo"),
+        )
+        .outerjoin(counter, counter.project_id == models.Project.id)
+    )
+
+
+def progress_row(row) -> dict:
+    return {
+        "project_id": row.id,
+        "project_name": row.name,
+        "total_tasks": row.total,
+        "completed": row.done,
+        "in_progress": row.in_progress,
+        "todo": row.todo,
+        "completion_rate": round(row.done / row.total, 2) if row.total > 0 else 0.0
+    }
+
+
 @router.post("/", response_model=schemas.ProjectOut, status_code=status.HTTP_201_CREATED)
 def create_project(project: schemas.ProjectCreate, db: Session = Depends(database.get_db), current_user: models.User = Depends(get_current_user)):
     new_project = models.Project(**project.model_dump())
@@ -22,16 +60,54 @@ def create_project(project: schemas.ProjectCreate, db: Session = Depends(databas
 
 
 @router.get("/", response_model=List[schemas.ProjectOut])
-def get_projects(skip: int = 0, limit: int = 20, db: Session = Depends(database.get_db), current_user: models.User = Depends(get_current_user)):
-    return db.query(models.Project).offset(skip).limit(limit).all()
+async def get_projects(
+    request: Request,
+    response: Response,
+    cursor: Optional[str] = cursor_param(),
+    skip: int = Query(0, ge=0, deprecated=True, description="Offset paging; use cursor instead"),
+    limit: int = page_limit(20),
+    fields: Optional[str] = fields_param(),
+    db: AsyncSession = Depends(database.get_async_db),
+    current_user: models.User = Depends(get_current_user)
+):
+    fieldset = sparse_fields(schemas.ProjectOut, models.Project, fields, PAGE_KEY)
+    not_modified = await check_stamps(request, response, db, table_stamp(models.Project))
+    if not_modified is not None:
+        return not_modified
+
+    query = keyset(select(models.Project).options(*fieldset.options), PAGE_KEY, cursor, limit)
+    if skip:
+        query = query.offset(skip)
+    result = await db.execute(query)
+    return json_list(fieldset.schema, finish_page(result.scalars().all(), PAGE_KEY, limit, response)[0], response)
+
+
+@router.get("/progress")
+async def get_all_project_progress(
+    request: Request,
+    response: Response,
+    cursor: Optional[str] = cursor_param(),
+    limit: int = page_limit(),
+    db: AsyncSession = Depends(database.get_async_db),
+    current_user: models.User = Depends(get_current_user)
+):
+    # Progress is read from the counters, so their stamp covers every task write
+    not_modified = await check_stamps(request, response, db, table_stamp(models.Project), table_stamp(models.ProjectTaskCounter))
+    if not_modified is not None:
+        return not_modified
+
+    result = await db.execute(keyset(progress_query(), PAGE_KEY, cursor, limit).add_columns(models.Project.created_at))
+    rows, _ = finish_page(result.all(), PAGE_KEY, limit, response)
+    return [progress_row(row) for row in rows]
 
 
 @router.get("/{project_id}", response_model=schemas.ProjectOut)
-def get_project(project_id: int, db: Session = Depends(database.get_db), current_user: models.User = Depends(get_current_user)):
-    project = db.query(models.Project).filter(models.Project.id == project_id).first()
+async def get_project(project_id: int, request: Request, response: Response, fields: Optional[str] = fields_param(), db: AsyncSession = Depends(database.get_async_db), current_user: models.User = Depends(get_current_user)):
+    fieldset = sparse_fields(schemas.ProjectOut, models.Project, fields, [models.Project.updated_at])
+    project = await db.get(models.Project, project_id, options=fieldset.options)
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
-    return project
+    return check_validators(request, response, [project.updated_at], project.updated_at) or json_one(fieldset.schema, project, response)
 
 
 @router.put("/{project_id}", response_model=schemas.ProjectOut)
@@ -58,12 +134,28 @@ def delete_project(project_id: int, db: Session = Depends(database.get_db), curr
     db.commit()
     return None
 @router.get("/{project_id}/tasks", response_model=List[schemas.TaskOut])
-def get_tasks_by_project(project_id: int, db: Session = Depends(database.get_db), current_user: models.User = Depends(get_current_user)):
-    project = db.query(models.Project).filter(models.Project.id == project_id).first()
+async def get_tasks_by_project(
+    project_id: int,
+    request: Request,
+    response: Response,
+    cursor: Optional[str] = cursor_param(),
+    limit: int = page_limit(),
+    fields: Optional[str] = fields_param(),
+    db: AsyncSession = Depends(database.get_async_db),
+    current_user: models.User = Depends(get_current_user)
+):
+    fieldset = sparse_fields(schemas.TaskOut, models.Task, fields, TASK_PAGE_KEY)
+    project = await db.get(models.Project, project_id)
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
-    
-    return db.query(models.Task).filter(models.Task.project_id == project_id).all()
+
+    not_modified = await check_stamps(request, response, db, table_stamp(models.Task, models.Task.project_id == project_id))
+    if not_modified is not None:
+        return not_modified
+
+    query = select(models.Task).where(models.Task.project_id == project_id).options(*fieldset.options)
+    result = await db.execute(keyset(query, TASK_PAGE_KEY, cursor, limit))
+    return json_list(fieldset.schema, finish_page(result.scalars().all(), TASK_PAGE_KEY, limit, response)[0], response)
 @router.post("/{project_id}/tasks", response_model=schemas.TaskOut, status_code=status.HTTP_201_CREATED)
 def create_task_under_project(
     project_id: int,
@@ -75,32 +167,28 @@ def create_task_under_project(
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
 
-    new_task = models.Task(**task.model_dump(), project_id=project_id)
+    new_task = models.Task(**task.model_dump(exclude={"project_id"}), project_id=project_id)
     db.add(new_task)
     db.commit()
     db.refresh(new_task)
     return new_task
 @router.get("/{project_id}/progress")
-def get_project_progress(
+async def get_project_progress(
     project_id: int,
-    db: Session = Depends(database.get_db),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(database.get_async_db),
     current_user: models.User = Depends(get_current_user)
 ):
-    project = db.query(models.Project).filter(models.Project.id == project_id).first()
-    if not project:
+    not_modified = await check_stamps(
+        request, response, db,
+        table_stamp(models.Project, models.Project.id == project_id),
+        table_stamp(models.ProjectTaskCounter, models.ProjectTaskCounter.project_id == project_id),
+    )
+    if not_modified is not None:
+        return not_modified
+
+    row = (await db.execute(progress_query().where(models.Project.id == project_id))).first()
+    if not row:
         raise HTTPException(status_code=404, detail="Project not found")
-
-    total = db.query(models.Task).filter(models.Task.project_id == project_id).count()
-    completed = db.query(models.Task).filter(models.Task.project_id == project_id, models.Task.status == models.TaskStatus.done).count()
-    in_progress = db.query(models.Task).filter(models.Task.project_id == project_id, models.Task.status == models.TaskStatus.in_progress).count()
-    todo = db.query(models.Task).filter(models.Task.project_id == project_id, models.Task.status == models.TaskStatus.todo).count()
-
-    return {
-        "project_id": project.id,
-        "project_name": project.name,
-        "total_tasks": total,
-        "completed": completed,
-        "in_progress": in_progress,
-        "todo": todo,
-        "completion_rate": round(completed / total, 2) if total > 0 else 0.0
-    }
+    return progress_row(row)
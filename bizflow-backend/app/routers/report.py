@@ -1,37 +1,78 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from sqlalchemy import func, case
+from fastapi import APIRouter, Depends, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func, case, select
 from app import models, database, auth_utils
-from typing import Dict
+from app.models.financial_record import RecordType
+from app.services.report_cache import cached_report
+from app.conditional import check_stamp_values, read_stamps, table_stamp
+from typing import Dict, Optional
 
 router = APIRouter(
     prefix="/reports",
     tags=["Reports"]
 )
 
+async def financial_summary(db: AsyncSession, stamp: Optional[tuple] = None) -> Dict[str, float]:
+    """Expense, revenue and net totals (cached per ``stamp`` of the financial rollup; shared with the dashboard)."""
+    if stamp is None:
+        stamp = await read_stamps(db, table_stamp(models.FinancialDailyRollup))
+
+    async def compute():
+        rollup = models.FinancialDailyRollup
+        totals = dict((await db.execute(
+            select(rollup.type, func.coalesce(func.sum(rollup.total), 0)).group_by(rollup.type)
+        )).all())
+        total_expense = totals.get(RecordType.expense, 0)
+        total_revenue = totals.get(RecordType.revenue, 0)
+
+        return {
+            "total_expense": total_expense,
+            "total_revenue": total_revenue,
+            "net": total_revenue - total_expense
+        }
+
+    return await cached_report("financial-summary", ["financial_records"], compute, params=stamp)
+
+async def task_status_count(db: AsyncSession, stamp: Optional[tuple] = None) -> Dict[str, int]:
+    """Number of tasks per status (cached per ``stamp`` of tasks; shared with the dashboard)."""
+    if stamp is None:
+        stamp = await read_stamps(db, table_stamp(models.Task))
+
+    async def compute():
+        result = await db.execute(
+            select(models.Task.status, func.count(models.Task.id)).group_by(models.Task.status)
+        )
+        return {status.value: count for status, count in result.all()}
+
+    return await cached_report("task-status-count", ["tasks"], compute, params=stamp)
+
 @router.get("/financial-summary", response_model=Dict[str, float])
-def get_financial_summary(db: Session = Depends(database.get_db), current_user: models.User = Depends(auth_utils.get_current_user)):
-    total_expense = db.query(func.coalesce(func.sum(models.FinancialRecord.amount), 0)) \
-        .filter(models.FinancialRecord.type == "Expense").scalar()
-    total_revenue = db.query(func.coalesce(func.sum(models.FinancialRecord.amount), 0)) \
-        .filter(models.FinancialRecord.type == "Revenue").scalar()
-
-    return {
-        "total_expense": total_expense,
-        "total_revenue": total_revenue,
-        "net": total_revenue - total_expense
-    }
+async def get_financial_summary(request: Request, response: Response, db: AsyncSession = Depends(database.get_async_db), current_user: models.User = Depends(auth_utils.get_current_user)):
+    stamp = await read_stamps(db, table_stamp(models.FinancialDailyRollup))
+    not_modified = check_stamp_values(request, response, stamp)
+    if not_modified is not None:
+        return not_modified
+
+    return await financial_summary(db, stamp)
 
 @router.get("/task-status-count", response_model=Dict[str, int])
-def get_task_status_count(db: Session = Depends(database.get_db), current_user: models.User = Depends(auth_utils.get_current_user)):
-    result = db.query(
-        models.Task.status,
-        func.count(models.Task.id)
-    ).group_by(models.Task.status).all()
+async def get_task_status_count(request: Request, response: Response, db: AsyncSession = Depends(database.get_async_db), current_user: models.User = Depends(auth_utils.get_current_user)):
+    stamp = await read_stamps(db, table_stamp(models.Task))
+    not_modified = check_stamp_values(request, response, stamp)
+    if not_modified is not None:
+        return not_modified
 
-    return {status.value: count for status, count in result}
+    return await task_status_count(db, stamp)
 
 @router.get("/inventory-snapshot", response_model=Dict[str, int])
-def get_inventory_snapshot(db: Session = Depends(database.get_db), current_user: models.User = Depends(auth_utils.get_current_user)):
-    items = db.query(models.InventoryItem).all()
-    return {item.name: item.quantity for item in items}
+async def get_inventory_snapshot(request: Request, response: Response, db: AsyncSession = Depends(database.get_async_db), current_user: models.User = Depends(auth_utils.get_current_user)):
+    stamp = await read_stamps(db, table_stamp(models.InventoryItem))
+    not_modified = check_stamp_values(request, response, stamp)
+    if not_modified is not None:
+        return not_modified
+
+    async def compute():
+        result = await db.execute(select(models.InventoryItem.name, models.InventoryItem.quantity))
+        return {name: quantity for name, quantity in result.all()}
+
+    return await cached_report("inventory-snapshot", ["inventory_items"], compute, params=stamp)
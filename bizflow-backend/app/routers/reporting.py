@@ -1,46 +1,128 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from sqlalchemy import func
-from typing import List, Dict
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func, select
+from datetime import date
+from typing import List, Dict, Optional
 
 from app import models, database
 from app.auth_utils import get_current_user
+from app.models.daily_rollup import NO_KEY
+from app.services.report_cache import cached_report
+from app.conditional import check_stamp_values, read_stamps, table_stamp
 
 router = APIRouter(
     prefix="/reports",
     tags=["Reports"]
 )
 
+# group_by value -> (rollup column, response field)
+RANGE_GROUPS = {
+    "day": ("day", "day"),
+    "project": ("project_key", "project_id"),
+    "task": ("task_key", "task_id"),
+}
+
+
+def _key_value(value):
+    return None if value == NO_KEY else value
+
+
+def _day_range(rollup, start=None, end=None) -> list:
+    criteria = []
+    if start is not None:
+        criteria.append(rollup.day >= start)
+    if end is not None:
+        criteria.append(rollup.day <= end)
+    return criteria
+
+
+async def _rollup_summary(db: AsyncSession, rollup, group_by: Optional[str] = None, start=None, end=None):
+    """Totals per type (and per ``group_by``) read from a daily rollup table."""
+    columns = [rollup.type]
+    if group_by:
+        columns.insert(0, getattr(rollup, RANGE_GROUPS[group_by][0]))
+    query = select(*columns, func.sum(rollup.total).label("total"), func.sum(rollup.entry_count).label("count"))
+    query = query.where(*_day_range(rollup, start, end))
+    # Rows whose entries were all moved or deleted linger with a zero count
+    query = query.group_by(*columns).having(func.sum(rollup.entry_count) > 0).order_by(*columns)
+
+    summary = []
+    for row in (await db.execute(query)).all():
+        item = {}
+        if group_by:
+            column, field = RANGE_GROUPS[group_by]
+            item[field] = row[0] if column == "day" else _key_value(row[0])
+        item.update(type=row.type, total=row.total, count=row.count)
+        summary.append(item)
+    return summary
+
+
+def _range_report(name: str, rollup, source):
+    async def report(
+        request: Request,
+        response: Response,
+        start: Optional[date] = Query(None, description="First day to include"),
+        end: Optional[date] = Query(None, description="Last day to include"),
+        group_by: Optional[str] = Query(None, pattern="^(day|project|task)$"),
+        db: AsyncSession = Depends(database.get_async_db),
+        current_user: models.User = Depends(get_current_user)
+    ):
+        if start and end and start > end:
+            raise HTTPException(status_code=400, detail="start must not be after end")
+        # The rollup rows the report reads, not the (much larger) source table
+        stamp = await read_stamps(db, table_stamp(rollup, *_day_range(rollup, start, end)))
+        not_modified = check_stamp_values(request, response, stamp)
+        if not_modified is not None:
+            return not_modified
+        return await cached_report(
+            name, [source.__tablename__], lambda: _rollup_summary(db, rollup, group_by, start, end), params=(start, end, group_by, stamp)
+        )
+    return report
+
+
+router.add_api_route(
+    "/accounting/range", _range_report("accounting/range", models.AccountingDailyRollup, models.AccountingEntry),
+    methods=["GET"], response_model=List[Dict], summary="Accounting totals for a date range",
+)
+router.add_api_route(
+    "/financial/range", _range_report("financial/range", models.FinancialDailyRollup, models.FinancialRecord),
+    methods=["GET"], response_model=List[Dict], summary="Financial record totals for a date range",
+)
+
 
 @router.get("/summary/by-project", response_model=List[Dict])
-def report_by_project(
-    db: Session = Depends(database.get_db),
+async def report_by_project(
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(database.get_async_db),
     current_user: models.User = Depends(get_current_user)
 ):
-    results = db.query(
-        models.AccountingEntry.project_id,
-        models.AccountingEntry.type,
-        func.sum(models.AccountingEntry.amount).label("total")
-    ).group_by(models.AccountingEntry.project_id, models.AccountingEntry.type).all()
+    stamp = await read_stamps(db, table_stamp(models.AccountingDailyRollup))
+    not_modified = check_stamp_values(request, response, stamp)
+    if not_modified is not None:
+        return not_modified
+
+    async def compute():
+        results = await _rollup_summary(db, models.AccountingDailyRollup, "project")
+        return [{"project_id": r["project_id"], "type": r["type"], "total": r["total"]} for r in results]
 
-    return [
-        {"project_id": r.project_id, "type": r.type, "total": r.total}
-        for r in results
-    ]
+    return await cached_report("summary/by-project", ["accounting_entries"], compute, params=stamp)
 
 
 @router.get("/summary/by-task", response_model=List[Dict])
-def report_by_task(
-    db: Session = Depends(database.get_db),
+async def report_by_task(
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(database.get_async_db),
     current_user: models.User = Depends(get_current_user)
 ):
-    results = db.query(
-        models.AccountingEntry.task_id,
-        models.AccountingEntry.type,
-        func.sum(models.AccountingEntry.amount).label("total")
-    ).group_by(models.AccountingEntry.task_id, models.AccountingEntry.type).all()
-
-    return [
-        {"task_id": r.task_id, "type": r.type, "total": r.total}
-        for r in results
-    ]
+    stamp = await read_stamps(db, table_stamp(models.AccountingDailyRollup))
+    not_modified = check_stamp_values(request, response, stamp)
+    if not_modified is not None:
+        return not_modified
+
+    async def compute():
+        results = await _rollup_summary(db, models.AccountingDailyRollup, "task")
+        return [{"task_id": r["task_id"], "type": r["type"], "total": r["total"]} for r in results]
+
+    return await cached_report("summary/by-task", ["accounting_entries"], compute, params=stamp)
@@ -0,0 +1,34 @@
+from fastapi import APIRouter, Depends, Query, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+
+from app import models, schemas, database
+from app.auth_utils import get_current_user
+from app.pagination import cursor_param, finish_page, keyset, page_limit
+from app.fast_json import json_list
+from app.services.search import search_query
+
+router = APIRouter(
+    prefix="/search",
+    tags=["Search"]
+)
+
+
+@router.get("/", response_model=List[schemas.SearchResult])
+async def search(
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=200, description="Words to look for; each must match (as a prefix)"),
+    kind: Optional[schemas.SearchKind] = Query(None, description="Only search this kind of record"),
+    cursor: Optional[str] = cursor_param(),
+    limit: int = page_limit(20),
+    db: AsyncSession = Depends(database.get_async_db),
+    current_user: models.User = Depends(get_current_user)
+):
+    matches = search_query(db.bind.dialect.name, q, [kind.value] if kind else None)
+    if matches is None:
+        return []
+    # Best matches first; kind and id break ties so the keyset order is total
+    page_key = (matches.c.rank, matches.c.kind, matches.c.id)
+    result = await db.execute(keyset(select(matches), page_key, cursor, limit))
+    return json_list(schemas.SearchResult, finish_page(result.all(), page_key, limit, response)[0], response)
@@ -1,16 +1,42 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy import and_, case, func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from datetime import datetime
 from app import models, schemas, database
 from app.auth_utils import get_current_user
-from app.services.notifier import send_email_notification  # ✅ new import
+from app.pagination import (
+    capped_count, cursor_param, finish_page, key_expressions, keyset, page_limit, set_total_count, sort_keys, sort_param,
+)
+from app.fast_json import json_list, json_one
+from app.sparse_fields import fields_param, sparse_fields
+from app.conditional import check_stamps, check_validators, table_stamp
+from app.bulk import bulk_body, insert_returning
+from app.models.project_task_counter import apply_counter_deltas
+from collections import Counter
+from app.services.notifier import enqueue_notification
+from app.services.inventory_snapshots import as_utc_naive
 
 router = APIRouter(
     prefix="/tasks",
     tags=["Tasks"]
 )
 
+# Tasks without a due date sort after every dated task
+NO_DUE_DATE = datetime(9999, 12, 31)
+
+# sort= names -> non-null sort expressions (updated_at is always set by its column default)
+SORTS = {
+    "created_at": models.Task.created_at,
+    "updated_at": models.Task.updated_at,
+    "due_date": func.coalesce(models.Task.due_date, NO_DUE_DATE),
+    # Enum columns sort by workflow order, not alphabetically
+    "priority": case(*((models.Task.priority == p, rank) for rank, p in enumerate(models.TaskPriority)), else_=-1),
+    "status": case(*((models.Task.status == s, rank) for rank, s in enumerate(models.TaskStatus)), else_=-1),
+    "title": models.Task.title,
+}
+
 @router.post("/", response_model=schemas.TaskOut, status_code=status.HTTP_201_CREATED)
 def create_task(task: schemas.TaskCreate, db: Session = Depends(database.get_db), current_user: models.User = Depends(get_current_user)):
     new_task = models.Task(**task.model_dump())
@@ -20,34 +46,95 @@ def create_task(task: schemas.TaskCreate, db: Session = Depends(database.get_db)
     return new_task
 
 
+@router.post("/bulk", response_model=List[schemas.TaskOut], status_code=status.HTTP_201_CREATED)
+def create_tasks_bulk(tasks: List[schemas.TaskCreate] = bulk_body(), db: Session = Depends(database.get_db), current_user: models.User = Depends(get_current_user)):
+    created = insert_returning(db, models.Task, [task.model_dump() for task in tasks])
+    # Bulk inserts skip the mapper events, so keep the project counters in step here
+    apply_counter_deltas(db.connection(), Counter((task.project_id, task.status) for task in created))
+    db.commit()
+    return created
+
+
 @router.get("/", response_model=List[schemas.TaskOut])
-def get_tasks(
-    skip: int = 0,
-    limit: int = 20,
+async def get_tasks(
+    request: Request,
+    response: Response,
+    cursor: Optional[str] = cursor_param(),
+    skip: int = Query(0, ge=0, deprecated=True, description="Offset paging; use cursor instead"),
+    limit: int = page_limit(20),
     assignee_id: int = None,
     project_id: int = None,
     status: schemas.TaskStatus = None,
-    db: Session = Depends(database.get_db),
+    priority: schemas.TaskPriority = None,
+    due_from: Optional[datetime] = Query(None, description="Due on or after this time"),
+    due_to: Optional[datetime] = Query(None, description="Due on or before this time"),
+    overdue: Optional[bool] = Query(None, description="Past due and not done (true) or not overdue (false)"),
+    updated_since: Optional[datetime] = Query(None, description="Changed at or after this time"),
+    sort: str = sort_param("created_at", list(SORTS)),
+    fields: Optional[str] = fields_param(),
+    db: AsyncSession = Depends(database.get_async_db),
     current_user: models.User = Depends(get_current_user),
 ):
-    query = db.query(models.Task)
+    fieldset = sparse_fields(schemas.TaskOut, models.Task, fields)
+    page_key = sort_keys(sort, SORTS, models.Task.id)
+    Task = models.Task
 
+    criteria = []
     if assignee_id is not None:
-        query = query.filter(models.Task.assignee_id == assignee_id)
+        criteria.append(Task.assignee_id == assignee_id)
     if project_id is not None:
-        query = query.filter(models.Task.project_id == project_id)
+        criteria.append(Task.project_id == project_id)
     if status is not None:
-        query = query.filter(models.Task.status == status)
-
-    return query.offset(skip).limit(limit).all()
+        criteria.append(Task.status == status)
+    if priority is not None:
+        criteria.append(Task.priority == priority)
+    if due_from is not None:
+        criteria.append(Task.due_date >= as_utc_naive(due_from))
+    if due_to is not None:
+        criteria.append(Task.due_date <= as_utc_naive(due_to))
+    if overdue is not None:
+        now = datetime.utcnow()
+        if overdue:
+            criteria.append(and_(Task.due_date < now, Task.status != models.TaskStatus.done))
+        else:
+            criteria.append(or_(Task.due_date.is_(None), Task.due_date >= now, Task.status == models.TaskStatus.done))
+    if updated_since is not None:
+        criteria.append(Task.updated_at >= as_utc_naive(updated_since))
+
+    not_modified = await check_stamps(request, response, db, table_stamp(models.Task, *criteria))
+    if not_modified is not None:
+        return not_modified
+
+    # The sort keys (for the next cursor) and the capped total ride along with the page
+    total = capped_count(select(Task.id).where(*criteria))
+    query = (
+        select(Task)
+        .where(*criteria)
+        .options(*fieldset.options)
+        .add_columns(*key_expressions(page_key), total.label("total_count"))
+    )
+    query = keyset(query, page_key, cursor, limit)
+    if skip:
+        query = query.offset(skip)
+    rows = (await db.execute(query)).all()
+    page = finish_page(rows, page_key, limit, response)[0]
+    if rows:
+        set_total_count(response, rows[0].total_count)
+    elif not cursor and not skip:
+        set_total_count(response, 0)
+    else:
+        # Past the last page no row carries the total
+        set_total_count(response, await db.scalar(select(total)))
+    return json_list(fieldset.schema, [row[0] for row in page], response)
 
 
 @router.get("/{task_id}", response_model=schemas.TaskOut)
-def get_task(task_id: int, db: Session = Depends(database.get_db), current_user: models.User = Depends(get_current_user)):
-    task = db.query(models.Task).filter(models.Task.id == task_id).first()
+async def get_task(task_id: int, request: Request, response: Response, fields: Optional[str] = fields_param(), db: AsyncSession = Depends(database.get_async_db), current_user: models.User = Depends(get_current_user)):
+    fieldset = sparse_fields(schemas.TaskOut, models.Task, fields, [models.Task.updated_at])
+    task = await db.get(models.Task, task_id, options=fieldset.options)
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
-    return task
+    return check_validators(request, response, [task.updated_at], task.updated_at) or json_one(fieldset.schema, task, response)
 
 
 @router.put("/{task_id}", response_model=schemas.TaskOut)
@@ -63,17 +150,22 @@ def update_task(task_id: int, task_update: schemas.TaskUpdate, db: Session = Dep
         setattr(task, key, value)
 
     task.updated_at = datetime.utcnow()
+
+    # 🔔 Notify if newly completed; queued in this transaction, sent by the outbox worker
+    if was_not_done and task.status == models.TaskStatus.done and task.assignee_id:
+        assignee_email = db.scalar(select(models.User.email).where(models.User.id == task.assignee_id))
+        if assignee_email:
+            enqueue_notification(
+                db,
+                user_email=assignee_email,
+                subject="✅ Task Completed",
+                message=f"Task '{task.title}' has been marked as done.",
+                user_id=task.assignee_id,
+            )
+
     db.commit()
     db.refresh(task)
 
-    # 🔔 Notify if newly completed
-    if was_not_done and task.status == models.TaskStatus.done and task.assignee:
-        send_email_notification(
-            user_email=task.assignee.email,
-            subject="✅ Task Completed",
-            message=f"Task '{task.title}' has been marked as done."
-        )
-
     return task
 
 
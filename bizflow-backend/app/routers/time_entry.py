@@ -1,33 +1,35 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy import Date, case, cast, func, select
 from sqlalchemy.orm import Session
-from typing import List
-from datetime import datetime
+from typing import List, Optional
+from datetime import date, datetime, time, timedelta
 from app import models, schemas, database
-from app.auth_utils import get_current_user
+from app.auth_utils import get_current_user, require_admin
+from app.pagination import cursor_param, finish_page, keyset, page_limit
+from app.fast_json import json_list
+from app.bulk import bulk_body, insert_returning, raise_row_errors
 
 router = APIRouter(
     prefix="/time-entries",
     tags=["Time Tracking"]
 )
 
-@router.post("/", response_model=schemas.TimeEntryOut, status_code=status.HTTP_201_CREATED)
-def log_time(
-    entry: schemas.TimeEntryCreate,
-    db: Session = Depends(database.get_db),
-    current_user: models.User = Depends(get_current_user)
-):
+PAGE_KEY = (models.TimeEntry.start_time, models.TimeEntry.id)
+
+def _entry_values(entry: schemas.TimeEntryCreate, user_id: int) -> dict:
+    """Normalize a time entry; raises ValueError when the times are inconsistent."""
     start = entry.start_time or datetime.utcnow()
     end = entry.end_time
 
     if end and end < start:
-        raise HTTPException(status_code=400, detail="End time cannot be before start time.")
+        raise ValueError("End time cannot be before start time.")
 
     duration = entry.duration_minutes
     if not duration and end:
         duration = int((end - start).total_seconds() / 60)
 
-    new_entry = models.TimeEntry(
-        user_id=current_user.id,
+    return dict(
+        user_id=user_id,
         task_id=entry.task_id,
         project_id=entry.project_id,
         start_time=start,
@@ -36,14 +38,144 @@ def log_time(
         note=entry.note,
     )
 
+@router.post("/", response_model=schemas.TimeEntryOut, status_code=status.HTTP_201_CREATED)
+def log_time(
+    entry: schemas.TimeEntryCreate,
+    db: Session = Depends(database.get_db),
+    current_user: models.User = Depends(get_current_user)
+):
+    try:
+        new_entry = models.TimeEntry(**_entry_values(entry, current_user.id))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
     db.add(new_entry)
     db.commit()
     db.refresh(new_entry)
     return new_entry
 
+@router.post("/bulk", response_model=List[schemas.TimeEntryOut], status_code=status.HTTP_201_CREATED)
+def log_time_bulk(
+    entries: List[schemas.TimeEntryCreate] = bulk_body(),
+    db: Session = Depends(database.get_db),
+    current_user: models.User = Depends(get_current_user)
+):
+    rows, errors = [], []
+    for index, entry in enumerate(entries):
+        try:
+            rows.append(_entry_values(entry, current_user.id))
+        except ValueError as e:
+            errors.append({"index": index, "msg": str(e)})
+    raise_row_errors(errors)
+
+    created = insert_returning(db, models.TimeEntry, rows)
+    db.commit()
+    return created
+
 @router.get("/", response_model=List[schemas.TimeEntryOut])
 def get_my_time_entries(
+    response: Response,
+    cursor: Optional[str] = cursor_param(),
+    limit: int = page_limit(),
     db: Session = Depends(database.get_db),
     current_user: models.User = Depends(get_current_user)
 ):
-    return db.query(models.TimeEntry).filter(models.TimeEntry.user_id == current_user.id).all()
+    query = db.query(models.TimeEntry).filter(models.TimeEntry.user_id == current_user.id)
+    rows = keyset(query, PAGE_KEY, cursor, limit).all()
+    return json_list(schemas.TimeEntryOut, finish_page(rows, PAGE_KEY, limit, response)[0], response)
+
+
+def _minutes_expression(dialect: str):
+    """Stored duration, else end - start in minutes; open entries count as 0."""
+    Entry = models.TimeEntry
+    if dialect == "sqlite":
+        elapsed = (func.julianday(Entry.end_time) - func.julianday(Entry.start_time)) * 1440
+    else:
+        elapsed = func.extract("epoch", Entry.end_time - Entry.start_time) / 60
+    return func.coalesce(Entry.duration_minutes, elapsed, 0)
+
+
+def _period_expression(dialect: str, period: str):
+    """First day of the entry's day or ISO week (weeks start on Monday)."""
+    start = models.TimeEntry.start_time
+    if period == "day":
+        return func.date(start)
+    if dialect == "sqlite":
+        return func.date(start, "weekday 0", "-6 days")
+    return cast(func.date_trunc("week", start), Date)
+
+
+def _timesheet(db: Session, period: str, start: Optional[date], end: Optional[date], user_id: Optional[int] = None, by_user: bool = False):
+    if start and end and start > end:
+        raise HTTPException(status_code=400, detail="start must not be after end")
+
+    Entry = models.TimeEntry
+    dialect = db.get_bind().dialect.name
+    bucket = _period_expression(dialect, period).label("period_start")
+    groups = [bucket, Entry.project_id, Entry.task_id]
+    if by_user:
+        groups.insert(1, Entry.user_id)
+    open_entry = (Entry.duration_minutes.is_(None)) & (Entry.end_time.is_(None))
+
+    query = select(
+        *groups,
+        func.sum(_minutes_expression(dialect)).label("minutes"),
+        func.count(Entry.id).label("entries"),
+        func.sum(case((open_entry, 1), else_=0)).label("open_entries"),
+    )
+    if user_id is not None:
+        query = query.where(Entry.user_id == user_id)
+    if start:
+        query = query.where(Entry.start_time >= datetime.combine(start, time.min))
+    if end:
+        query = query.where(Entry.start_time < datetime.combine(end + timedelta(days=1), time.min))
+    query = query.group_by(*groups).order_by(*groups)
+
+    rows = []
+    for row in db.execute(query):
+        period_start = row.period_start
+        if isinstance(period_start, str):  # SQLite date() returns text
+            period_start = date.fromisoformat(period_start)
+        if period == "week":
+            year, week, _ = period_start.isocalendar()
+            label = f"{year}-W{week:02d}"
+        else:
+            label = period_start.isoformat()
+        rows.append({
+            "period": label,
+            "period_start": period_start,
+            "user_id": row.user_id if by_user else user_id,
+            "project_id": row.project_id,
+            "task_id": row.task_id,
+            "minutes": int(round(row.minutes or 0)),
+            "entries": row.entries,
+            "open_entries": row.open_entries or 0,
+        })
+    return rows
+
+
+def period_param():
+    return Query("week", pattern="^(day|week)$", description="Bucket by day or ISO week")
+
+
+@router.get("/timesheet", response_model=List[schemas.TimesheetRow])
+def get_my_timesheet(
+    period: str = period_param(),
+    start: Optional[date] = Query(None, description="First day to include"),
+    end: Optional[date] = Query(None, description="Last day to include"),
+    db: Session = Depends(database.get_db),
+    current_user: models.User = Depends(get_current_user)
+):
+    return _timesheet(db, period, start, end, user_id=current_user.id)
+
+
+@router.get("/timesheet/all", response_model=List[schemas.TimesheetRow])
+def get_all_timesheets(
+    start: date = Query(..., description="First day to include"),
+    end: date = Query(..., description="Last day to include"),
+    period: str = period_param(),
+    user_id: Optional[int] = None,
+    db: Session = Depends(database.get_db),
+    current_user: models.User = Depends(require_admin)
+):
+    return _timesheet(db, period, start, end, user_id=user_id, by_user=True)
@@ -1,8 +1,10 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
-from app import models, schemas, database, utils
+from starlette.concurrency import run_in_threadpool
+from app import models, schemas, database
 from app.auth_utils import get_current_user
+from app.services import password_hashing
 import logging
 import re
 from datetime import datetime
@@ -32,6 +34,19 @@ def validate_email(email: str) -> bool:
     pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
     return bool(re.match(pattern, email))
 
+def _email_taken(db: Session, email: str) -> bool:
+    return db.query(models.User.id).filter(models.User.email == email).first() is not None
+
+def _insert_user(db: Session, new_user: models.User) -> models.User:
+    db.add(new_user)
+    try:
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    db.refresh(new_user)
+    return new_user
+
 @router.post("/", response_model=schemas.UserOut, status_code=status.HTTP_201_CREATED)
 async def create_user(user: schemas.UserCreate, db: Session = Depends(database.get_db)):
     """
@@ -63,15 +78,14 @@ async def create_user(user: schemas.UserCreate, db: Session = Depends(database.g
             )
 
         # Check if user already exists
-        existing_user = db.query(models.User).filter(models.User.email == user.email).first()
-        if existing_user:
+        if await run_in_threadpool(_email_taken, db, user.email):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Email already registered"
             )
 
         # Hash the password
-        hashed_password = utils.hash_password(user.password)
+        hashed_password = await password_hashing.hash_password(user.password)
         
         # Create new user
         new_user = models.User(
@@ -80,11 +94,9 @@ async def create_user(user: schemas.UserCreate, db: Session = Depends(database.g
             role=user.role
         )
         
-        db.add(new_user)
-        db.commit()
-        db.refresh(new_user)
+        new_user = await run_in_threadpool(_insert_user, db, new_user)
         
-        logger.info(f"New user created: {new_user.email}")
+        logger.info("New user created: %s", new_user.email)
         return new_user
         
     except IntegrityError:
@@ -93,6 +105,12 @@ async def create_user(user: schemas.UserCreate, db: Session = Depends(database.g
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered"
         )
+    except password_hashing.HashingPoolSaturated:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Server is busy, please retry shortly",
+            headers={"Retry-After": "1"},
+        )
     except HTTPException:
         # Re-raise HTTP exceptions without modification
         raise
@@ -0,0 +1,120 @@
+"""Schema version stamp for the models' tables.
+
+The version is a fingerprint of ``Base.metadata`` (tables, columns, indexes).
+Development databases are created with ``create_all`` and stamped. Production
+runs with ``SCHEMA_MODE=check``, which compares the stamp with the models in a
+single query instead of reflecting every table on each worker start:
+
+    python -m app.schema create   # create missing tables, stamp if unstamped
+    python -m app.schema check    # exit 1 if the database is not at the models' version
+    python -m app.schema stamp    # record the current version after a manual migration
+"""
+
+from datetime import datetime
+from sqlalchemy import Column, DateTime, MetaData, String, Table, delete, insert, select
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import DBAPIError
+from typing import Optional
+import hashlib
+import logging
+import sys
+
+from app.database import Base, engine as default_engine
+
+logger = logging.getLogger(__name__)
+
+# Kept out of Base.metadata so it is not part of its own fingerprint
+_version_metadata = MetaData()
+schema_version = Table(
+    "schema_version",
+    _version_metadata,
+    Column("version", String(64), primary_key=True),
+    Column("stamped_at", DateTime, nullable=False),
+)
+
+
+class SchemaMismatch(RuntimeError):
+    pass
+
+
+def schema_fingerprint(metadata: MetaData = Base.metadata) -> str:
+    """Stable hash of every table, column and index declared by the models."""
+    from app import models  # noqa: F401 - register every model
+
+    parts = []
+    for table in sorted(metadata.tables.values(), key=lambda t: t.name):
+        parts.append(f"table {table.name}")
+        for column in table.columns:
+            parts.append(f"  column {column.name} {column.type} nullable={column.nullable} pk={column.primary_key}")
+        for index in sorted(table.indexes, key=lambda i: i.name or ""):
+            columns = ",".join(column.name for column in index.columns)
+            parts.append(f"  index {index.name} ({columns}) unique={bool(index.unique)}")
+    return hashlib.sha256("\n".join(parts).encode()).hexdigest()[:16]
+
+
+def stored_version(connection: Connection) -> Optional[str]:
+    try:
+        return connection.execute(select(schema_version.c.version)).scalar()
+    except DBAPIError:
+        # No version table yet
+        connection.rollback()
+        return None
+
+
+def stamp(connection: Connection, version: Optional[str] = None) -> str:
+    version = version or schema_fingerprint()
+    _version_metadata.create_all(connection)
+    connection.execute(delete(schema_version))
+    connection.execute(insert(schema_version).values(version=version, stamped_at=datetime.utcnow()))
+    connection.commit()
+    return version
+
+
+def create(bind: Engine = default_engine) -> None:
+    """Create missing tables; stamp databases that have no version yet."""
+    from app import models  # noqa: F401 - register every model
+
+    Base.metadata.create_all(bind=bind)
+    expected = schema_fingerprint()
+    with bind.connect() as connection:
+        current = stored_version(connection)
+        if current is None:
+            stamp(connection, expected)
+        elif current != expected:
+            # create_all never alters existing tables, so the database may lag the models
+            logger.warning(
+                "Schema version %s does not match the models (%s); migrate the database, "
+                "then run `python -m app.schema stamp`", current, expected
+            )
+
+
+def check(bind: Engine = default_engine) -> None:
+    expected = schema_fingerprint()
+    with bind.connect() as connection:
+        current = stored_version(connection)
+    if current != expected:
+        raise SchemaMismatch(
+            f"Database schema version is {current or 'missing'}, models expect {expected}. "
+            "Create or migrate the schema, then run `python -m app.schema stamp`."
+        )
+
+
+if __name__ == "__main__":
+    commands = {"create", "check", "stamp"}
+    if len(sys.argv) != 2 or sys.argv[1] not in commands:
+        print("usage: python -m app.schema create|check|stamp")
+        sys.exit(2)
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    command = sys.argv[1]
+    if command == "create":
+        create()
+    elif command == "check":
+        try:
+            check()
+        except SchemaMismatch as e:
+            print(e)
+            sys.exit(1)
+        print("Schema is up to date")
+    else:
+        with default_engine.connect() as conn:
+            print(f"Stamped schema version {stamp(conn)}")
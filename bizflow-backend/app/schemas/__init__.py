@@ -1,10 +1,12 @@
 from app.schemas.user import UserBase, UserCreate, UserOut, Token, TokenData
 from app.schemas.task import TaskBase, TaskCreate, TaskUpdate, TaskOut, TaskStatus, TaskPriority
 from app.schemas.project import ProjectCreate, ProjectUpdate, ProjectOut
-from app.schemas.inventory import InventoryCreate, InventoryUpdate, InventoryOut
+from app.schemas.inventory import InventoryCreate, InventoryUpdate, InventoryOut, StockAtOut
 from app.schemas.inventory_transaction import InventoryTransactionCreate, InventoryTransactionOut
 from app.schemas.financial_record import FinancialRecordCreate, FinancialRecordOut
-from app.schemas.time_entry import TimeEntryCreate, TimeEntryOut
+from app.schemas.time_entry import TimeEntryCreate, TimeEntryOut, TimesheetRow
+from app.schemas.search import SearchKind, SearchResult
+from app.schemas.dashboard import DashboardOut, DashboardTask, DashboardLowStockItem, ProjectProgressOut
 from app.schemas.accounting import AccountingEntryCreate, AccountingEntryOut, TransactionType as AccountingTransactionType
 
 
@@ -26,13 +28,21 @@ __all__ = [
     "InventoryCreate",
     "InventoryUpdate",
     "InventoryOut",
+    "StockAtOut",
     "InventoryTransactionCreate",
     "InventoryTransactionOut",
     "FinancialRecordCreate",
     "FinancialRecordOut",
     "TimeEntryCreate",
     "TimeEntryOut",
+    "TimesheetRow",
     "AccountingEntryCreate",
     "AccountingEntryOut",
-    "AccountingTransactionType"
+    "AccountingTransactionType",
+    "SearchKind",
+    "SearchResult",
+    "DashboardOut",
+    "DashboardTask",
+    "DashboardLowStockItem",
+    "ProjectProgressOut"
 ]
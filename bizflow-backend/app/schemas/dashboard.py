@@ -0,0 +1,49 @@
+from pydantic import BaseModel
+from typing import Dict, List, Optional
+from datetime import datetime
+from app.schemas.task import TaskPriority, TaskStatus
+
+
+class ProjectProgressOut(BaseModel):
+    project_id: int
+    project_name: str
+    total_tasks: int
+    completed: int
+    in_progress: int
+    todo: int
+    completion_rate: float
+
+
+class DashboardTask(BaseModel):
+    id: int
+    title: str
+    status: Optional[TaskStatus] = None
+    priority: Optional[TaskPriority] = None
+    due_date: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+
+class DashboardLowStockItem(BaseModel):
+    id: int
+    name: str
+    sku: str
+    quantity: int
+    low_stock_threshold: Optional[int] = None
+
+    class Config:
+        from_attributes = True
+
+
+class DashboardOut(BaseModel):
+    financial: Dict[str, float]  # total_expense, total_revenue, net
+    task_status: Dict[str, int]  # task count per status
+    overdue_tasks: int
+    my_open_tasks: int  # not done and assigned to the caller
+    total_projects: int
+    projects: List[ProjectProgressOut]  # newest projects
+    low_stock_count: int
+    low_stock: List[DashboardLowStockItem]  # lowest quantity first
+    recent_tasks: List[DashboardTask]  # most recently updated
+    generated_at: datetime
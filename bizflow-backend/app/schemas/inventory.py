@@ -25,3 +25,10 @@ class InventoryOut(InventoryBase):
 
     class Config:
         from_attributes = True
+
+class StockAtOut(BaseModel):
+    item_id: int
+    sku: str
+    name: str
+    quantity: int
+    ts: datetime
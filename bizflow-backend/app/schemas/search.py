@@ -0,0 +1,18 @@
+from pydantic import BaseModel
+from enum import Enum
+
+
+class SearchKind(str, Enum):
+    task = "task"
+    project = "project"
+    inventory = "inventory"
+
+
+class SearchResult(BaseModel):
+    kind: SearchKind
+    id: int
+    title: str  # task title, project name or item name
+    rank: float  # -1 for the best match of its kind, towards 0 for weaker ones
+
+    class Config:
+        from_attributes = True
@@ -1,6 +1,6 @@
 from pydantic import BaseModel
 from typing import Optional
-from datetime import datetime
+from datetime import date, datetime
 
 class TimeEntryBase(BaseModel):
     task_id: Optional[int] = None
@@ -19,3 +19,13 @@ class TimeEntryOut(TimeEntryBase):
 
     class Config:
         from_attributes = True  # for Pydantic v2
+
+class TimesheetRow(BaseModel):
+    period: str  # "2024-05-06" for days, "2024-W19" for ISO weeks
+    period_start: date
+    user_id: Optional[int] = None
+    project_id: Optional[int] = None
+    task_id: Optional[int] = None
+    minutes: int
+    entries: int
+    open_entries: int  # started but neither ended nor given a duration
@@ -0,0 +1,150 @@
+"""Point-in-time stock levels from inventory snapshots plus a bounded ledger replay.
+
+A snapshot records an item's quantity together with the newest ledger row it
+already includes. Stock at time ``ts`` is the latest snapshot taken at or
+before ``ts`` plus the transactions after it up to ``ts``. Items with no such
+snapshot are replayed backwards from their earliest later snapshot, or from
+the live quantity. Snapshots are written whenever a quantity is set directly
+and should also be taken periodically (e.g. nightly from cron), so a replay
+never covers more than one period of transactions:
+
+    python -m app.services.inventory_snapshots take
+"""
+
+from datetime import datetime, timezone
+from sqlalchemy import DateTime, func, insert, literal, or_, select
+from sqlalchemy.orm import Session
+from typing import Dict, Iterable, Optional
+import logging
+import sys
+
+from app.models.inventory import InventoryItem
+from app.models.inventory_snapshot import InventorySnapshot, last_transaction_id
+from app.models.inventory_transaction import InventoryTransaction
+
+logger = logging.getLogger(__name__)
+
+
+def as_utc_naive(ts: datetime) -> datetime:
+    """Timestamps are stored as naive UTC; normalise aware input to match."""
+    if ts.tzinfo is not None:
+        return ts.astimezone(timezone.utc).replace(tzinfo=None)
+    return ts
+
+
+def take_snapshots(db: Session, now: Optional[datetime] = None) -> int:
+    """Snapshot every item in one INSERT ... SELECT. Returns the number of snapshots."""
+    items = InventoryItem.__table__
+    current = select(
+        items.c.id,
+        func.coalesce(items.c.quantity, 0),
+        last_transaction_id(),
+        literal(now or datetime.utcnow(), DateTime),
+    )
+    result = db.execute(
+        insert(InventorySnapshot.__table__).from_select(
+            ["item_id", "quantity", "last_transaction_id", "taken_at"], current
+        )
+    )
+    db.commit()
+    logger.info("Took %s inventory snapshots", result.rowcount)
+    return result.rowcount
+
+
+def stock_at(db: Session, ts: datetime, item_ids: Optional[Iterable[int]] = None) -> Dict[int, int]:
+    """Quantity on hand at ``ts`` for each item that existed then (optionally only ``item_ids``)."""
+    ts = as_utc_naive(ts)
+    items = InventoryItem.__table__
+    snapshots = InventorySnapshot.__table__
+    transactions = InventoryTransaction.__table__
+
+    before_ids = (
+        select(snapshots.c.item_id, func.max(snapshots.c.id).label("id"))
+        .where(snapshots.c.taken_at <= ts)
+        .group_by(snapshots.c.item_id)
+        .subquery()
+    )
+    after_ids = (
+        select(snapshots.c.item_id, func.min(snapshots.c.id).label("id"))
+        .where(snapshots.c.taken_at > ts)
+        .group_by(snapshots.c.item_id)
+        .subquery()
+    )
+    before = snapshots.alias("before_snapshot")
+    after = snapshots.alias("after_snapshot")
+
+    query = (
+        select(items.c.id, items.c.quantity, before.c.quantity.label("before_quantity"), after.c.quantity.label("after_quantity"))
+        .select_from(
+            items
+            .outerjoin(before_ids, before_ids.c.item_id == items.c.id)
+            .outerjoin(before, before.c.id == before_ids.c.id)
+            .outerjoin(after_ids, after_ids.c.item_id == items.c.id)
+            .outerjoin(after, after.c.id == after_ids.c.id)
+        )
+        .where(or_(items.c.created_at.is_(None), items.c.created_at <= ts))
+    )
+    if item_ids is not None:
+        query = query.where(items.c.id.in_(list(item_ids)))
+
+    anchors = {}
+    for row in db.execute(query):
+        if row.before_quantity is not None:
+            anchors[row.id] = row.before_quantity
+        elif row.after_quantity is not None:
+            anchors[row.id] = row.after_quantity
+        else:
+            anchors[row.id] = row.quantity or 0
+    if not anchors:
+        return {}
+
+    # Forward: ledger rows after the earlier snapshot, up to ts
+    forward = (
+        select(transactions.c.item_id, func.sum(transactions.c.quantity_change))
+        .select_from(
+            transactions
+            .join(before_ids, before_ids.c.item_id == transactions.c.item_id)
+            .join(before, before.c.id == before_ids.c.id)
+        )
+        .where(
+            transactions.c.item_id.in_(list(anchors)),
+            transactions.c.id > func.coalesce(before.c.last_transaction_id, 0),
+            transactions.c.timestamp <= ts,
+        )
+        .group_by(transactions.c.item_id)
+    )
+    # Backward: ledger rows after ts that the later snapshot (or the live quantity) includes
+    backward = (
+        select(transactions.c.item_id, -func.sum(transactions.c.quantity_change))
+        .select_from(
+            transactions
+            .outerjoin(before_ids, before_ids.c.item_id == transactions.c.item_id)
+            .outerjoin(after_ids, after_ids.c.item_id == transactions.c.item_id)
+            .outerjoin(after, after.c.id == after_ids.c.id)
+        )
+        .where(
+            transactions.c.item_id.in_(list(anchors)),
+            before_ids.c.id.is_(None),
+            transactions.c.timestamp > ts,
+            or_(after.c.id.is_(None), transactions.c.id <= func.coalesce(after.c.last_transaction_id, 0)),
+        )
+        .group_by(transactions.c.item_id)
+    )
+    for query in (forward, backward):
+        for item_id, delta in db.execute(query):
+            anchors[item_id] += delta or 0
+    return anchors
+
+
+if __name__ == "__main__":
+    from app.database import SessionLocal
+
+    if sys.argv[1:] != ["take"]:
+        print("usage: python -m app.services.inventory_snapshots take")
+        sys.exit(2)
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    session = SessionLocal()
+    try:
+        take_snapshots(session)
+    finally:
+        session.close()
@@ -1,7 +1,22 @@
+from sqlalchemy.orm import Session
+from typing import Optional
 from app import models
 import logging
 
+
 def send_email_notification(user_email: str, subject: str, message: str):
     # Placeholder: simulate sending email
-    logging.info(f"Sending email to {user_email}: {subject} - {message}")
+    logging.info("Sending email to %s: %s - %s", user_email, subject, message)
     # In production, integrate with SendGrid/Mailgun/SMTP
+
+
+def enqueue_notification(db: Session, user_email: str, subject: str, message: str, user_id: Optional[int] = None):
+    """Queue an email in the caller's transaction; the outbox worker sends it after commit."""
+    db.add(models.NotificationOutbox(
+        recipient_id=user_id,
+        recipient_email=user_email,
+        subject=subject,
+        body=message,
+    ))
+    # Lets the worker wake up as soon as this transaction commits
+    db.info["outbox_written"] = True
@@ -0,0 +1,261 @@
+"""Background delivery of the notification outbox.
+
+An asyncio task started from the app lifespan claims pending outbox rows in
+batches, merges rows for the same recipient into one email and sends them over
+a single reused SMTP connection. Failed deliveries are retried with
+exponential backoff until ``OUTBOX_MAX_ATTEMPTS``.
+
+Without ``SMTP_HOST`` emails are only logged. To watch real SMTP traffic
+locally, run a debugging server and point the worker at it:
+
+    python -m aiosmtpd -n -l localhost:1025
+    SMTP_HOST=localhost SMTP_PORT=1025 uvicorn app.main:app
+"""
+
+from datetime import datetime, timedelta
+from email.message import EmailMessage
+from sqlalchemy import event, or_, select, update
+from sqlalchemy.orm import Session
+from threading import Lock
+from typing import Dict, List, Optional
+import asyncio
+import logging
+import os
+import random
+import smtplib
+import time
+
+from app.database import SessionLocal
+from app.models.notification_outbox import NotificationOutbox, OutboxStatus
+from app.services.notifier import send_email_notification
+
+logger = logging.getLogger(__name__)
+
+OUTBOX_BATCH_SIZE = int(os.getenv("OUTBOX_BATCH_SIZE", "100"))
+OUTBOX_POLL_INTERVAL = float(os.getenv("OUTBOX_POLL_INTERVAL", "5"))
+OUTBOX_MAX_ATTEMPTS = int(os.getenv("OUTBOX_MAX_ATTEMPTS", "8"))
+OUTBOX_BACKOFF_BASE = float(os.getenv("OUTBOX_BACKOFF_BASE", "2"))
+OUTBOX_BACKOFF_MAX = float(os.getenv("OUTBOX_BACKOFF_MAX", "900"))
+OUTBOX_LEASE_SECONDS = int(os.getenv("OUTBOX_LEASE_SECONDS", "300"))
+
+SMTP_HOST = os.getenv("SMTP_HOST")
+SMTP_PORT = int(os.getenv("SMTP_PORT", "25"))
+SMTP_USER = os.getenv("SMTP_USER")
+SMTP_PASSWORD = os.getenv("SMTP_PASSWORD")
+SMTP_STARTTLS = os.getenv("SMTP_STARTTLS", "false").lower() == "true"
+SMTP_FROM = os.getenv("SMTP_FROM", "BizFlow <no-reply@bizflow.local>")
+SMTP_TIMEOUT = float(os.getenv("SMTP_TIMEOUT", "10"))
+SMTP_IDLE_SECONDS = float(os.getenv("SMTP_IDLE_SECONDS", "60"))
+
+
+class SMTPMailer:
+    """Keeps one SMTP connection open between batches and reconnects when it drops."""
+
+    def __init__(self):
+        self._smtp: Optional[smtplib.SMTP] = None
+        self._last_used = 0.0
+
+    def _connect(self) -> smtplib.SMTP:
+        smtp = smtplib.SMTP(SMTP_HOST, SMTP_PORT, timeout=SMTP_TIMEOUT)
+        if SMTP_STARTTLS:
+            smtp.starttls()
+        if SMTP_USER:
+            smtp.login(SMTP_USER, SMTP_PASSWORD or "")
+        return smtp
+
+    def send(self, recipient: str, subject: str, body: str) -> None:
+        message = EmailMessage()
+        message["From"] = SMTP_FROM
+        message["To"] = recipient
+        message["Subject"] = subject
+        message.set_content(body)
+
+        if self._smtp is None:
+            self._smtp = self._connect()
+        try:
+            self._smtp.send_message(message)
+        except smtplib.SMTPServerDisconnected:
+            # The server closed an idle connection; retry once on a fresh one
+            self._smtp = self._connect()
+            self._smtp.send_message(message)
+        self._last_used = time.monotonic()
+
+    def close_if_idle(self) -> None:
+        if self._smtp is not None and time.monotonic() - self._last_used > SMTP_IDLE_SECONDS:
+            self.close()
+
+    def close(self) -> None:
+        if self._smtp is not None:
+            try:
+                self._smtp.quit()
+            except smtplib.SMTPException:
+                pass
+            self._smtp = None
+
+
+class LogMailer:
+    """Stand-in used when no SMTP server is configured."""
+
+    def send(self, recipient: str, subject: str, body: str) -> None:
+        send_email_notification(recipient, subject, body)
+
+    def close_if_idle(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+def backoff_seconds(attempts: int) -> float:
+    """Exponential backoff with jitter, capped at OUTBOX_BACKOFF_MAX."""
+    delay = min(OUTBOX_BACKOFF_MAX, OUTBOX_BACKOFF_BASE ** attempts)
+    return delay * random.uniform(0.5, 1.0)
+
+
+def coalesce(rows: List[NotificationOutbox]) -> Dict[str, List[NotificationOutbox]]:
+    """Group claimed rows by recipient so each user gets one email per batch."""
+    grouped: Dict[str, List[NotificationOutbox]] = {}
+    for row in rows:
+        grouped.setdefault(row.recipient_email, []).append(row)
+    return grouped
+
+
+def compose(rows: List[NotificationOutbox]):
+    if len(rows) == 1:
+        return rows[0].subject, rows[0].body
+    subject = f"{len(rows)} BizFlow notifications"
+    body = "\n\n".join(f"{row.subject}\n{row.body}" for row in rows)
+    return subject, body
+
+
+class OutboxWorker:
+    def __init__(self, session_factory=SessionLocal, mailer=None, batch_size: int = OUTBOX_BATCH_SIZE):
+        self.session_factory = session_factory
+        self.mailer = mailer or (SMTPMailer() if SMTP_HOST else LogMailer())
+        self.batch_size = batch_size
+        self.sent = 0
+        self.retried = 0
+        self.failed = 0
+        self._stats_lock = Lock()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def claim_batch(self, db: Session) -> List[NotificationOutbox]:
+        """Lease up to ``batch_size`` due rows; rows another worker claimed first are skipped."""
+        now = datetime.utcnow()
+        due = or_(NotificationOutbox.status == OutboxStatus.pending, NotificationOutbox.status == OutboxStatus.sending)
+        ids = db.execute(
+            select(NotificationOutbox.id)
+            .where(due, NotificationOutbox.next_attempt_at <= now)
+            .order_by(NotificationOutbox.id)
+            .limit(self.batch_size)
+        ).scalars().all()
+        if not ids:
+            return []
+        claimed = db.scalars(
+            update(NotificationOutbox)
+            .where(NotificationOutbox.id.in_(ids), due, NotificationOutbox.next_attempt_at <= now)
+            .values(status=OutboxStatus.sending, next_attempt_at=now + timedelta(seconds=OUTBOX_LEASE_SECONDS))
+            .returning(NotificationOutbox)
+            .execution_options(synchronize_session=False)
+        ).all()
+        db.commit()
+        return claimed
+
+    def process_batch(self) -> int:
+        """Claim and deliver one batch. Returns the number of outbox rows handled."""
+        db = self.session_factory()
+        try:
+            rows = self.claim_batch(db)
+            for recipient, group in coalesce(rows).items():
+                subject, body = compose(group)
+                try:
+                    self.mailer.send(recipient, subject, body)
+                except Exception as e:
+                    self._record_failure(group, e)
+                else:
+                    now = datetime.utcnow()
+                    for row in group:
+                        row.status = OutboxStatus.sent
+                        row.sent_at = now
+                        row.last_error = None
+                    with self._stats_lock:
+                        self.sent += len(group)
+                # Commit per recipient so a crash cannot resend what already went out
+                db.commit()
+            return len(rows)
+        finally:
+            db.close()
+
+    def _record_failure(self, rows: List[NotificationOutbox], error: Exception) -> None:
+        logger.warning("Sending %d notification(s) to %s failed: %s", len(rows), rows[0].recipient_email, error)
+        for row in rows:
+            row.attempts += 1
+            row.last_error = str(error)
+            if row.attempts >= OUTBOX_MAX_ATTEMPTS:
+                row.status = OutboxStatus.failed
+                with self._stats_lock:
+                    self.failed += 1
+            else:
+                row.status = OutboxStatus.pending
+                row.next_attempt_at = datetime.utcnow() + timedelta(seconds=backoff_seconds(row.attempts))
+                with self._stats_lock:
+                    self.retried += 1
+        # A broken connection must not poison the next recipient's attempt
+        self.mailer.close()
+
+    def notify(self) -> None:
+        """Wake the worker early; safe to call from any thread."""
+        if self._loop is not None and self._wakeup is not None:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    async def run(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        while True:
+            self._wakeup.clear()
+            try:
+                handled = await asyncio.to_thread(self.process_batch)
+            except Exception as e:
+                logger.error("Outbox batch failed: %s", e)
+                handled = 0
+            if handled >= self.batch_size:
+                continue  # more is probably waiting
+            await asyncio.to_thread(self.mailer.close_if_idle)
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=OUTBOX_POLL_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+
+    def start(self) -> None:
+        self._task = asyncio.get_running_loop().create_task(self.run(), name="outbox-worker")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self._loop = None
+        await asyncio.to_thread(self.mailer.close)
+
+    def stats(self) -> Dict[str, int]:
+        with self._stats_lock:
+            return {"sent": self.sent, "retried": self.retried, "failed": self.failed}
+
+
+worker = OutboxWorker()
+
+
+@event.listens_for(Session, "after_commit")
+def _wake_worker(session):
+    if session.info.pop("outbox_written", False):
+        worker.notify()
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_outbox_write(session):
+    session.info.pop("outbox_written", None)
@@ -0,0 +1,58 @@
+"""Bounded worker pool for bcrypt so password checks never run on the event loop."""
+
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+import asyncio
+import logging
+import os
+
+from app import utils
+
+logger = logging.getLogger(__name__)
+
+HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+# Maximum number of hash jobs running or waiting; beyond this requests are rejected
+HASH_QUEUE_LIMIT = int(os.getenv("PASSWORD_HASH_QUEUE_LIMIT", str(HASH_WORKERS * 8)))
+
+_executor = ThreadPoolExecutor(max_workers=HASH_WORKERS, thread_name_prefix="password-hash")
+_lock = Lock()
+_pending = 0
+_rejected = 0
+
+
+class HashingPoolSaturated(Exception):
+    """Raised when the hashing queue is full and the job was not accepted."""
+
+
+async def _submit(fn, *args):
+    global _pending, _rejected
+    with _lock:
+        if _pending >= HASH_QUEUE_LIMIT:
+            _rejected += 1
+            raise HashingPoolSaturated()
+        _pending += 1
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_executor, fn, *args)
+    finally:
+        with _lock:
+            _pending -= 1
+
+
+async def hash_password(password: str) -> str:
+    """Hash a password on the hashing pool."""
+    return await _submit(utils.hash_password, password)
+
+
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password on the hashing pool."""
+    return await _submit(utils.verify_password, plain_password, hashed_password)
+
+
+def get_pool_stats() -> dict:
+    return {
+        "workers": HASH_WORKERS,
+        "queue_limit": HASH_QUEUE_LIMIT,
+        "pending": _pending,
+        "rejected": _rejected,
+    }
@@ -0,0 +1,95 @@
+"""Cache for the ``/reports`` endpoints, invalidated by table versions.
+
+Each tracked table has a version number that is bumped whenever a committed
+transaction wrote to it, whether through unit-of-work flushes or through
+``session.execute(insert/update/delete(...))`` as the bulk endpoints do.
+Cached results are keyed by the versions of the tables they read, so a report
+is served from memory until one of its tables changes.
+
+Versions live in this process only; with several workers the TTL bounds how
+long another worker's writes can go unnoticed. Endpoints that send an ETag
+pass the database stamp it was derived from in ``params``, so their cached
+body always matches the ETag, whichever worker wrote last.
+"""
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_mapper
+from threading import Lock
+from typing import Awaitable, Callable, Dict, Hashable, Iterable, Tuple
+import os
+
+from app.services.cache import TTLCache
+
+TRACKED_TABLES = frozenset({"financial_records", "accounting_entries", "tasks", "inventory_items"})
+
+REPORT_CACHE_TTL = float(os.getenv("REPORT_CACHE_TTL", "300"))
+REPORT_CACHE_MAXSIZE = int(os.getenv("REPORT_CACHE_MAXSIZE", "256"))
+
+report_cache = TTLCache(maxsize=REPORT_CACHE_MAXSIZE, ttl=REPORT_CACHE_TTL)
+
+_versions: Dict[str, int] = {}
+_versions_lock = Lock()
+_MISSING = object()
+
+
+def table_versions(tables: Iterable[str]) -> Tuple[int, ...]:
+    with _versions_lock:
+        return tuple(_versions.get(table, 0) for table in sorted(tables))
+
+
+def bump_versions(tables: Iterable[str]) -> None:
+    with _versions_lock:
+        for table in tables:
+            _versions[table] = _versions.get(table, 0) + 1
+
+
+async def cached_report(name: str, tables: Iterable[str], compute: Callable[[], Awaitable], params: Hashable = None):
+    """Return the cached result of ``compute()`` for the current versions of ``tables``."""
+    # Read versions before computing: a write committed meanwhile bumps the
+    # version, so a possibly stale result is stored under a key nobody asks for again
+    key = (name, params, table_versions(tables))
+    result = report_cache.get(key, _MISSING)
+    if result is _MISSING:
+        result = await compute()
+        report_cache.set(key, result)
+    return result
+
+
+def get_report_cache_stats() -> Dict[str, int]:
+    return report_cache.stats()
+
+
+def _pending_tables(session) -> set:
+    return session.info.setdefault("report_tables_written", set())
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_flushed_tables(session, flush_context):
+    written = {
+        table.name
+        for obj in (*session.new, *session.dirty, *session.deleted)
+        for table in object_mapper(obj).tables
+        if table.name in TRACKED_TABLES
+    }
+    if written:
+        _pending_tables(session).update(written)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _collect_executed_tables(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        table = getattr(orm_execute_state.statement, "table", None)
+        if table is not None and table.name in TRACKED_TABLES:
+            _pending_tables(orm_execute_state.session).add(table.name)
+
+
+@event.listens_for(Session, "after_commit")
+def _bump_committed_tables(session):
+    written = session.info.pop("report_tables_written", None)
+    if written:
+        bump_versions(written)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rolled_back_tables(session):
+    session.info.pop("report_tables_written", None)
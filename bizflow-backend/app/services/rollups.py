@@ -0,0 +1,71 @@
+"""Maintenance for the daily accounting and financial rollups.
+
+The rollups are kept current by mapper events in ``app.models.daily_rollup``
+and by the bulk endpoints. Rebuild them from scratch after imports or manual
+SQL that bypassed the ORM:
+
+    python -m app.services.rollups rebuild
+"""
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.orm import Session
+import logging
+import sys
+
+from app.models.daily_rollup import NO_KEY, ROLLUPS
+
+logger = logging.getLogger(__name__)
+
+
+def rebuild_rollups(db: Session) -> int:
+    """Recompute every rollup from its source table. Returns the number of rollup rows."""
+    written = 0
+    for source, (rollup, timestamp_attr) in ROLLUPS.items():
+        day = func.date(getattr(source, timestamp_attr))
+        project_key = func.coalesce(source.project_id, NO_KEY)
+        task_key = func.coalesce(source.task_id, NO_KEY)
+        totals = (
+            select(
+                day.label("day"),
+                project_key.label("project_key"),
+                task_key.label("task_key"),
+                source.type,
+                func.sum(source.amount).label("total"),
+                func.count(source.id).label("entry_count"),
+            )
+            .where(getattr(source, timestamp_attr).isnot(None))
+            .group_by(day, project_key, task_key, source.type)
+        )
+        table = rollup.__table__
+        db.execute(table.delete())
+        result = db.execute(
+            insert(table).from_select(["day", "project_key", "task_key", "type", "total", "entry_count"], totals)
+        )
+        written += max(result.rowcount, 0)
+    db.commit()
+    logger.info("Rebuilt %s daily rollup rows", written)
+    return written
+
+
+def ensure_rollups(db: Session) -> None:
+    """Populate the rollups once when their tables are new but entries already exist."""
+    for source, (rollup, _) in ROLLUPS.items():
+        has_rollups = db.execute(select(rollup.day).limit(1)).first() is not None
+        has_entries = db.execute(select(source.id).limit(1)).first() is not None
+        if has_entries and not has_rollups:
+            rebuild_rollups(db)
+            return
+
+
+if __name__ == "__main__":
+    from app.database import SessionLocal
+
+    if sys.argv[1:] != ["rebuild"]:
+        print("usage: python -m app.services.rollups rebuild")
+        sys.exit(2)
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    session = SessionLocal()
+    try:
+        rebuild_rollups(session)
+    finally:
+        session.close()
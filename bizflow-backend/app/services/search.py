@@ -0,0 +1,213 @@
+"""Full-text search over tasks, projects and inventory items.
+
+Each searchable table gets a database-maintained index; nothing in the
+application has to keep it in sync:
+
+- SQLite: an external-content FTS5 table ``<table>_fts`` updated by
+  insert/update/delete triggers, ranked with ``bm25``.
+- PostgreSQL: a generated ``search_vector tsvector`` column with a GIN index,
+  ranked with ``ts_rank_cd``.
+
+The indexes are created by ``init_db`` in ``SCHEMA_MODE=create``. Databases
+managed with ``SCHEMA_MODE=check`` need them created once:
+
+    python -m app.services.search ensure    # create missing indexes and triggers
+    python -m app.services.search rebuild   # re-index everything (SQLite only)
+
+Raw scores are only comparable within one index (bm25 in particular depends
+on each FTS table's own statistics), so every source's scores are divided by
+that source's best score before the sources are merged. The merged ``rank``
+runs from -1 (the best match of its kind) towards 0; lower is better.
+"""
+
+from sqlalchemy import Float, column, func, literal, literal_column, select, table, text, type_coerce, union_all
+from sqlalchemy.orm import Session
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+import logging
+import os
+import re
+import sys
+
+from app import models
+
+logger = logging.getLogger(__name__)
+
+# PostgreSQL text search configuration used for documents and queries
+SEARCH_LANGUAGE = os.getenv("SEARCH_LANGUAGE", "english")
+MAX_QUERY_TERMS = 8
+
+if not re.fullmatch(r"\w+", SEARCH_LANGUAGE):
+    raise ValueError(f"SEARCH_LANGUAGE must be a text search configuration name, got {SEARCH_LANGUAGE!r}")
+
+
+class SearchSource(NamedTuple):
+    model: type
+    # Indexed columns, most important first; the first one is returned as the result title
+    columns: Tuple[str, ...]
+    # bm25 / setweight weight per column
+    weights: Tuple[float, ...]
+
+
+SOURCES: Dict[str, SearchSource] = {
+    "task": SearchSource(models.Task, ("title", "description"), (10.0, 1.0)),
+    "project": SearchSource(models.Project, ("name", "description"), (10.0, 1.0)),
+    "inventory": SearchSource(models.InventoryItem, ("name", "sku", "category"), (10.0, 10.0, 2.0)),
+}
+
+# setweight() labels for PostgreSQL, by column position
+_PG_LABELS = "ABCD"
+
+_TERM = re.compile(r"[^\W_]+")
+
+
+def query_terms(q: str) -> List[str]:
+    """Words of a user query; punctuation and search operators are dropped."""
+    return _TERM.findall(q.lower())[:MAX_QUERY_TERMS]
+
+
+def _fts_name(source: SearchSource) -> str:
+    return f"{source.model.__tablename__}_fts"
+
+
+def _sqlite_select(kind: str, source: SearchSource, terms: Sequence[str]):
+    fts_name = _fts_name(source)
+    fts = table(fts_name, column("rowid"))
+    model = source.model
+    # Every term must match, as a prefix so partially typed words find results
+    match = " AND ".join(f'"{term}"*' for term in terms)
+    rank = func.bm25(literal_column(fts_name), *source.weights)
+    return (
+        select(
+            literal(kind).label("kind"),
+            model.id.label("id"),
+            getattr(model, source.columns[0]).label("title"),
+            rank.label("rank"),
+        )
+        .select_from(fts.join(model.__table__, model.id == fts.c.rowid))
+        .where(literal_column(fts_name).op("MATCH")(match))
+    )
+
+
+def _postgres_select(kind: str, source: SearchSource, terms: Sequence[str]):
+    model = source.model
+    vector = literal_column(f"{model.__tablename__}.search_vector")
+    tsquery = func.to_tsquery(
+        literal_column(f"'{SEARCH_LANGUAGE}'::regconfig"), " & ".join(f"{term}:*" for term in terms)
+    )
+    return (
+        select(
+            literal(kind).label("kind"),
+            model.id.label("id"),
+            getattr(model, source.columns[0]).label("title"),
+            (-func.ts_rank_cd(vector, tsquery)).label("rank"),
+        )
+        .where(vector.op("@@")(tsquery))
+    )
+
+
+def _normalized(matches):
+    """``matches`` with its rank scaled to -1 for its best row, towards 0 for weaker ones."""
+    source = matches.subquery()
+    raw = type_coerce(source.c.rank, Float)
+    best = func.min(raw).over()
+    # A best score of 0 means every row scored 0: all tie as best
+    rank = func.coalesce(-(raw / type_coerce(func.nullif(best, 0.0), Float)), -1.0)
+    return select(source.c.kind, source.c.id, source.c.title, rank.label("rank"))
+
+
+def search_query(dialect: str, q: str, kinds: Optional[Sequence[str]] = None):
+    """Ranked matches for ``q`` as a subquery with ``kind``, ``id``, ``title`` and ``rank`` columns.
+
+    Returns ``None`` when ``q`` has no searchable words.
+    """
+    terms = query_terms(q)
+    if not terms:
+        return None
+    build = _sqlite_select if dialect == "sqlite" else _postgres_select
+    selects = [_normalized(build(kind, SOURCES[kind], terms)) for kind in (kinds or SOURCES)]
+    return union_all(*selects).subquery("matches")
+
+
+def _sqlite_ddl(source: SearchSource) -> List[str]:
+    name = source.model.__tablename__
+    fts_name = _fts_name(source)
+    cols = ", ".join(source.columns)
+    new = ", ".join(f"new.{c}" for c in source.columns)
+    old = ", ".join(f"old.{c}" for c in source.columns)
+    delete_old = f"INSERT INTO {fts_name}({fts_name}, rowid, {cols}) VALUES ('delete', old.id, {old});"
+    insert_new = f"INSERT INTO {fts_name}(rowid, {cols}) VALUES (new.id, {new});"
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts_name} USING fts5("
+        f"{cols}, content='{name}', content_rowid='id', tokenize='unicode61 remove_diacritics 2')",
+        f"CREATE TRIGGER IF NOT EXISTS {fts_name}_ai AFTER INSERT ON {name} BEGIN {insert_new} END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts_name}_ad AFTER DELETE ON {name} BEGIN {delete_old} END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts_name}_au AFTER UPDATE OF {cols} ON {name} BEGIN {delete_old} {insert_new} END",
+    ]
+
+
+def _postgres_ddl(source: SearchSource) -> List[str]:
+    name = source.model.__tablename__
+    vector = " || ".join(
+        f"setweight(to_tsvector('{SEARCH_LANGUAGE}'::regconfig, coalesce({c}, '')), '{_PG_LABELS[i]}')"
+        for i, c in enumerate(source.columns)
+    )
+    return [
+        f"ALTER TABLE {name} ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS ({vector}) STORED",
+        f"CREATE INDEX IF NOT EXISTS ix_{name}_search_vector ON {name} USING GIN (search_vector)",
+    ]
+
+
+def _sqlite_tables(db: Session) -> set:
+    return set(db.execute(text("SELECT name FROM sqlite_master WHERE type = 'table'")).scalars())
+
+
+def ensure_search(db: Session) -> None:
+    """Create any missing search indexes (and, on SQLite, their triggers)."""
+    dialect = db.get_bind().dialect.name
+    if dialect == "sqlite":
+        existing = _sqlite_tables(db)
+        for source in SOURCES.values():
+            for statement in _sqlite_ddl(source):
+                db.execute(text(statement))
+            if _fts_name(source) not in existing:
+                # Index rows written before the FTS table existed
+                _rebuild_fts(db, source)
+    elif dialect == "postgresql":
+        for source in SOURCES.values():
+            for statement in _postgres_ddl(source):
+                db.execute(text(statement))
+    else:
+        logger.warning("Full-text search is not supported on %s", dialect)
+        return
+    db.commit()
+
+
+def _rebuild_fts(db: Session, source: SearchSource) -> None:
+    fts_name = _fts_name(source)
+    db.execute(text(f"INSERT INTO {fts_name}({fts_name}) VALUES ('rebuild')"))
+
+
+def rebuild_search(db: Session) -> None:
+    """Re-index every row. Only SQLite needs this; PostgreSQL computes the vectors itself."""
+    if db.get_bind().dialect.name != "sqlite":
+        logger.info("Search vectors are generated columns; nothing to rebuild")
+        return
+    for source in SOURCES.values():
+        _rebuild_fts(db, source)
+    db.commit()
+    logger.info("Rebuilt the full-text search indexes")
+
+
+if __name__ == "__main__":
+    from app.database import SessionLocal
+
+    commands = {"ensure": ensure_search, "rebuild": rebuild_search}
+    if len(sys.argv) != 2 or sys.argv[1] not in commands:
+        print("usage: python -m app.services.search ensure|rebuild")
+        sys.exit(2)
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    session = SessionLocal()
+    try:
+        commands[sys.argv[1]](session)
+    finally:
+        session.close()
@@ -0,0 +1,71 @@
+"""Maintenance for the per-project task counters.
+
+The counters are kept current by mapper events in
+``app.models.project_task_counter``. Rebuild them from scratch after bulk
+imports or manual SQL that bypassed the ORM:
+
+    python -m app.services.task_counters rebuild
+"""
+
+from sqlalchemy import case, func, insert, select
+from sqlalchemy.orm import Session
+import logging
+import sys
+
+from app import models
+from app.models.project_task_counter import ProjectTaskCounter
+from app.models.task import TaskStatus
+
+logger = logging.getLogger(__name__)
+
+
+def rebuild_counters(db: Session) -> int:
+    """Recompute every project's counters from the tasks table. Returns the number of projects."""
+    Task = models.Task
+
+    def count_status(status):
+        return func.coalesce(func.sum(case((Task.status == status, 1), else_=0)), 0)
+
+    counts = (
+        select(
+            models.Project.id.label("project_id"),
+            func.count(Task.id).label("total"),
+            count_status(TaskStatus.todo).label("todo"),
+            count_status(TaskStatus.in_progress).label("in_progress"),
+            count_status(TaskStatus.done).label("done"),
+        )
+        .select_from(models.Project)
+        .outerjoin(Task, Task.project_id == models.Project.id)
+        .group_by(models.Project.id)
+    )
+
+    table = ProjectTaskCounter.__table__
+    db.execute(table.delete())
+    result = db.execute(
+        insert(table).from_select(["project_id", "total", "todo", "in_progress", "done"], counts)
+    )
+    db.commit()
+    logger.info("Rebuilt task counters for %s projects", result.rowcount)
+    return result.rowcount
+
+
+def ensure_counters(db: Session) -> None:
+    """Populate the counters once when the table is new but projects already exist."""
+    has_counters = db.execute(select(ProjectTaskCounter.project_id).limit(1)).first() is not None
+    has_projects = db.execute(select(models.Project.id).limit(1)).first() is not None
+    if has_projects and not has_counters:
+        rebuild_counters(db)
+
+
+if __name__ == "__main__":
+    from app.database import SessionLocal
+
+    if sys.argv[1:] != ["rebuild"]:
+        print("usage: python -m app.services.task_counters rebuild")
+        sys.exit(2)
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    session = SessionLocal()
+    try:
+        rebuild_counters(session)
+    finally:
+        session.close()
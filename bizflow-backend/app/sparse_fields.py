@@ -0,0 +1,56 @@
+"""Sparse fieldsets: ``?fields=id,title,status`` on list and detail endpoints.
+
+The requested fields become a ``load_only`` option, so columns nobody asked
+for (e.g. ``Task.description``) are not selected at all, and a trimmed copy of
+the response schema that serializes just those fields. Without ``fields`` the
+full schema is used and every column is loaded as before.
+"""
+
+from fastapi import HTTPException, Query, status
+from pydantic import ConfigDict, create_model
+from sqlalchemy.orm import load_only
+from functools import lru_cache
+from typing import NamedTuple, Optional, Sequence, Tuple
+
+
+class FieldSet(NamedTuple):
+    schema: type
+    # Loader options for select(...).options(*options) / query.options(*options) / db.get(..., options=...)
+    options: tuple
+
+
+def fields_param():
+    return Query(None, description="Comma-separated fields to return, e.g. id,title,status (default: all fields)")
+
+
+@lru_cache(maxsize=None)
+def _trimmed_schema(schema, names: Tuple[str, ...]):
+    definitions = {name: (schema.model_fields[name].annotation, schema.model_fields[name]) for name in names}
+    return create_model(f"{schema.__name__}Fields", __config__=ConfigDict(from_attributes=True), **definitions)
+
+
+def sparse_fields(schema, model, fields: Optional[str], always: Sequence = ()) -> FieldSet:
+    """Resolve ``fields`` against ``schema`` and ``model``.
+
+    ``always`` lists columns that must be loaded even when not returned, such
+    as the keyset page key the next cursor is built from or ``updated_at`` for
+    the ETag. Unknown field names are rejected with a 400; a ``fields`` naming
+    nothing (``?fields=,``) means all fields.
+    """
+    requested = {name.strip() for name in (fields or "").split(",") if name.strip()}
+    if not requested:
+        return FieldSet(schema, ())
+
+    unknown = requested - schema.model_fields.keys()
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields: {', '.join(sorted(unknown))}. Available: {', '.join(schema.model_fields)}",
+        )
+    # Declaration order, so equal field sets share one trimmed schema
+    names = tuple(name for name in schema.model_fields if name in requested)
+
+    column_keys = model.__mapper__.column_attrs.keys()
+    load = [name for name in names if name in column_keys]
+    load += [column.key for column in always if column.key not in load]
+    return FieldSet(_trimmed_schema(schema, names), (load_only(*(getattr(model, key) for key in load)),))
@@ -0,0 +1,31 @@
+"""Test helpers for keeping endpoint query counts in check.
+
+    from app.testing import assert_max_queries
+
+    def test_list_projects(client, auth_headers):
+        with assert_max_queries(2):
+            client.get("/projects/", headers=auth_headers)
+
+``client``, ``auth_headers`` and a ``max_queries`` fixture wrapping this helper
+live in ``tests/conftest.py``; ``tests/test_query_budget.py`` holds the list
+endpoint budgets. Statements issued by the endpoint through either engine are
+counted; the assertion message lists each statement shape so an N+1 is easy
+to spot.
+"""
+
+from contextlib import contextmanager
+from typing import Iterator
+
+from app import query_recorder
+from app.database import async_engine, engine
+
+
+@contextmanager
+def assert_max_queries(limit: int) -> Iterator[query_recorder.QueryRecorder]:
+    query_recorder.install(engine)
+    query_recorder.install(async_engine.sync_engine)
+    with query_recorder.record_queries() as recorder:
+        yield recorder
+    if recorder.count > limit:
+        raise AssertionError(f"Expected at most {limit} SQL statements, got {recorder.summary()}")
+
@@ -12,7 +12,10 @@ load_dotenv()
 logger = logging.getLogger(__name__)
 
 # Password hashing configuration
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Changing BCRYPT_ROUNDS is picked up transparently: hashes with a different
+# cost are flagged by pwd_context.needs_update() and rehashed on next login.
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=BCRYPT_ROUNDS)
 
 # JWT configuration
 SECRET_KEY = os.getenv("JWT_SECRET_KEY")
@@ -40,6 +43,10 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
         logger.error(f"Error verifying password: {str(e)}")
         raise
 
+def password_needs_rehash(hashed_password: str) -> bool:
+    """Check whether a stored hash uses outdated parameters."""
+    return pwd_context.needs_update(hashed_password)
+
 def create_access_token(data: dict, expires_delta: timedelta = None) -> str:
     """Create a new JWT access token."""
     try:
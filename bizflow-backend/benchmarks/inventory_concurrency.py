@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""Concurrent stock pick benchmark for POST /inventory/transactions/.
+
+Starts N parallel writers that each remove one unit of the same SKU at a time.
+The item is stocked for only half of the attempts, so the run checks both that
+no update is lost and that stock never goes negative:
+
+    cd bizflow-backend
+    python benchmarks/inventory_concurrency.py --writers 50 --picks 20
+
+With the default SQLite configuration the run uses a throwaway database in a
+temporary directory. Set USE_SQLITE=false and the DB_* variables to run it
+against PostgreSQL instead; it creates its own user and item there.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark")
+os.environ.setdefault("DB_QUERY_DEBUG", "false")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--writers", type=int, default=50, help="parallel writers (default 50)")
+    parser.add_argument("--picks", type=int, default=20, help="picks per writer (default 20)")
+    args = parser.parse_args()
+
+    if os.getenv("USE_SQLITE", "true").lower() == "true":
+        # The SQLite URL is relative to the working directory
+        os.chdir(tempfile.mkdtemp(prefix="bizflow-bench-"))
+
+    from fastapi.testclient import TestClient
+    from app import models
+    from app.auth_utils import get_current_user
+    from app.database import SessionLocal, init_db
+    from app.main import app
+
+    attempts = args.writers * args.picks
+    initial_stock = attempts // 2
+
+    init_db()
+    db = SessionLocal()
+    user = models.User(email=f"bench-{uuid.uuid4().hex[:8]}@example.com", hashed_password="-", role="admin")
+    item = models.InventoryItem(name="Benchmark SKU", sku=f"BENCH-{uuid.uuid4().hex[:8]}", quantity=initial_stock)
+    db.add_all([user, item])
+    db.commit()
+    item_id = item.id
+    db.expunge(user)
+    db.close()
+
+    app.dependency_overrides[get_current_user] = lambda: user
+    payload = {"item_id": item_id, "quantity_change": -1, "type": "Subtraction"}
+
+    def writer(_):
+        client = TestClient(app)
+        return [client.post("/inventory/transactions/", json=payload).status_code for _ in range(args.picks)]
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.writers) as pool:
+        statuses = [code for result in pool.map(writer, range(args.writers)) for code in result]
+    elapsed = time.perf_counter() - started
+
+    db = SessionLocal()
+    final_stock = db.get(models.InventoryItem, item_id).quantity
+    recorded = db.query(models.InventoryTransaction).filter(models.InventoryTransaction.item_id == item_id).count()
+    db.close()
+
+    accepted = statuses.count(201)
+    rejected = statuses.count(400)
+    errors = len(statuses) - accepted - rejected
+    ok = final_stock == 0 and accepted == initial_stock == recorded and errors == 0
+
+    print(f"writers={args.writers} attempts={attempts} initial_stock={initial_stock}")
+    print(f"accepted={accepted} rejected={rejected} errors={errors} transactions={recorded}")
+    print(f"final_stock={final_stock} (expected 0)")
+    print(f"elapsed={elapsed:.2f}s throughput={attempts / elapsed:.0f} requests/s")
+    print("OK" if ok else "FAILED")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
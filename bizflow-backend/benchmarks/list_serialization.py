@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""Serialization benchmark for large list responses.
+
+Loads N inventory transactions into a throwaway SQLite database and times
+turning the ORM rows into JSON bytes three ways:
+
+- encoder: validate, ``jsonable_encoder`` and ``json.dumps`` (what FastAPI does
+  when a response class such as ``JSONResponse`` is set)
+- model_dump: validate each row, ``model_dump(mode="json")`` and ``json.dumps``
+- json_list: ``app.fast_json.json_list`` (validation and JSON bytes in pydantic-core)
+
+and then times GET /inventory/transactions/ end to end with one page of N rows:
+
+    cd bizflow-backend
+    python benchmarks/list_serialization.py --rows 10000 --runs 5
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark")
+os.environ.setdefault("DB_QUERY_DEBUG", "false")
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+
+def median_ms(fn, runs: int) -> float:
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10000, help="rows per response (default 10000)")
+    parser.add_argument("--runs", type=int, default=5, help="timed runs per variant (default 5)")
+    args = parser.parse_args()
+
+    # The page size limit is read at import time
+    os.environ["MAX_PAGE_SIZE"] = str(max(args.rows, int(os.getenv("MAX_PAGE_SIZE", "500"))))
+    # The SQLite URL is relative to the working directory
+    os.chdir(tempfile.mkdtemp(prefix="bizflow-bench-"))
+
+    from fastapi.encoders import jsonable_encoder
+    from fastapi.testclient import TestClient
+    from pydantic import TypeAdapter
+    from typing import List
+    from app import models, schemas
+    from app.auth_utils import get_current_user
+    from app.database import SessionLocal, init_db
+    from app.fast_json import json_list
+    from app.main import app
+
+    init_db()
+    db = SessionLocal()
+    user = models.User(email="bench@example.com", hashed_password="-", role="admin")
+    item = models.InventoryItem(name="Benchmark SKU", sku="BENCH-1", quantity=0)
+    db.add_all([user, item])
+    db.commit()
+    start = datetime(2024, 1, 1)
+    db.bulk_insert_mappings(models.InventoryTransaction, [
+        {
+            "item_id": item.id, "quantity_change": 1, "type": "Addition", "performed_by": user.id,
+            "note": f"restock {i}", "timestamp": start + timedelta(minutes=i),
+        }
+        for i in range(args.rows)
+    ])
+    db.commit()
+    rows = db.query(models.InventoryTransaction).all()
+    db.expunge(user)
+
+    schema = schemas.InventoryTransactionOut
+    adapter = TypeAdapter(List[schema])
+
+    def encoder():
+        return json.dumps(jsonable_encoder(adapter.validate_python(rows, from_attributes=True))).encode()
+
+    def model_dump():
+        return json.dumps([schema.model_validate(row).model_dump(mode="json") for row in rows]).encode()
+
+    def fast():
+        return json_list(schema, rows).body
+
+    if json.loads(encoder()) != json.loads(fast()):
+        print("json_list output differs from the encoder output")
+        return 1
+
+    results = {name: median_ms(fn, args.runs) for name, fn in (("encoder", encoder), ("model_dump", model_dump), ("json_list", fast))}
+    db.close()
+
+    app.dependency_overrides[get_current_user] = lambda: user
+    with TestClient(app) as client:
+        def endpoint():
+            response = client.get("/inventory/transactions/", params={"limit": args.rows})
+            assert response.status_code == 200 and len(response.json()) == args.rows
+        results["endpoint"] = median_ms(endpoint, args.runs)
+
+    print(f"{args.rows} rows, median of {args.runs} runs")
+    for name, ms in results.items():
+        print(f"  {name:<11} {ms:8.1f} ms")
+    print(f"json_list is {results['encoder'] / results['json_list']:.1f}x faster than the encoder path")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""Query budget check for the busiest list endpoints.
+
+Seeds a throwaway SQLite database with enough projects and tasks that an N+1
+would show, then requests each endpoint in ``BUDGETS`` under
+``app.testing.assert_max_queries``. Exits 1 and prints the statements of every
+endpoint that went over its budget:
+
+    cd bizflow-backend
+    python benchmarks/query_budget.py
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark")
+os.environ.setdefault("DB_QUERY_DEBUG", "false")
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+# path -> most SQL statements one request may issue (authentication is bypassed)
+BUDGETS = {
+    "/tasks/": 2,
+    "/tasks/?sort=-priority,due_date": 2,
+    "/projects/": 2,
+    "/projects/progress": 3,
+}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--projects", type=int, default=20, help="projects to seed (default 20)")
+    parser.add_argument("--tasks", type=int, default=10, help="tasks per project (default 10)")
+    args = parser.parse_args()
+
+    # The SQLite URL is relative to the working directory
+    os.chdir(tempfile.mkdtemp(prefix="bizflow-bench-"))
+
+    from fastapi.testclient import TestClient
+    from app import models
+    from app.auth_utils import get_current_user
+    from app.database import SessionLocal, init_db
+    from app.main import app
+    from app.testing import assert_max_queries
+
+    init_db()
+    db = SessionLocal()
+    user = models.User(email="bench@example.com", hashed_password="-", role="admin")
+    db.add(user)
+    db.commit()
+    start = datetime(2024, 1, 1)
+    statuses = list(models.TaskStatus)
+    for p in range(args.projects):
+        project = models.Project(name=f"Project {p}")
+        db.add(project)
+        db.flush()
+        db.add_all([
+            models.Task(
+                title=f"Task {p}-{t}", project_id=project.id, assignee_id=user.id,
+                status=statuses[t % len(statuses)], due_date=start + timedelta(days=t),
+            )
+            for t in range(args.tasks)
+        ])
+    db.commit()
+    db.expunge(user)
+    db.close()
+
+    failures = 0
+    app.dependency_overrides[get_current_user] = lambda: user
+    with TestClient(app) as client:
+        for path, budget in BUDGETS.items():
+            try:
+                with assert_max_queries(budget) as recorder:
+                    response = client.get(path)
+                    assert response.status_code == 200, f"{path} returned {response.status_code}"
+            except AssertionError as e:
+                failures += 1
+                print(f"FAIL {path}: {e}")
+            else:
+                print(f"ok   {path}: {recorder.count} of {budget} statements")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
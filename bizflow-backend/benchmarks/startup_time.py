@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""Cold start benchmark for the API process.
+
+Each run starts a fresh interpreter and times three phases:
+
+- import: ``import app.main``
+- build: ``create_app()`` (routers, middleware)
+- ready: the lifespan startup (schema handling, background worker)
+
+    cd bizflow-backend
+    python benchmarks/startup_time.py --runs 5 --budget-ms 1500
+
+The run fails when the median time to ready (including interpreter start)
+exceeds the budget, so it can guard CI. SCHEMA_MODE and the other startup
+settings are taken from the environment; with SQLite a throwaway database in
+a temporary directory is used and created once before timing.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+CHILD = """
+import asyncio, json, time
+started = time.perf_counter()
+import app.main
+imported = time.perf_counter()
+application = app.main.create_app()
+built = time.perf_counter()
+
+async def start_and_stop():
+    async with application.router.lifespan_context(application):
+        return time.perf_counter()
+
+ready = asyncio.run(start_and_stop())
+print(json.dumps({"import": imported - started, "build": built - imported, "ready": ready - built}))
+"""
+
+
+def run_once(env) -> dict:
+    started = time.perf_counter()
+    output = subprocess.run(
+        [sys.executable, "-c", CHILD], env=env, cwd=env["BENCH_CWD"], capture_output=True, text=True, check=True
+    ).stdout
+    total = time.perf_counter() - started
+    phases = json.loads(output.strip().splitlines()[-1])
+    phases["total"] = total
+    return phases
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=float(os.getenv("STARTUP_BUDGET_MS", "1500")))
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+    env.setdefault("JWT_SECRET_KEY", "benchmark")
+    env.setdefault("OUTBOX_WORKER_ENABLED", "false")
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(BACKEND_DIR), env.get("PYTHONPATH")]))
+    env["BENCH_CWD"] = str(BACKEND_DIR)
+    if env.get("USE_SQLITE", "true").lower() == "true":
+        # The SQLite URL is relative to the working directory
+        env["BENCH_CWD"] = tempfile.mkdtemp(prefix="bizflow-startup-")
+        subprocess.run(
+            [sys.executable, "-m", "app.schema", "create"], env=env, cwd=env["BENCH_CWD"], check=True, capture_output=True
+        )
+
+    runs = [run_once(env) for _ in range(args.runs)]
+    print(f"schema_mode={env.get('SCHEMA_MODE', 'create')} runs={args.runs}")
+    for phase in ("import", "build", "ready", "total"):
+        values = [run[phase] * 1000 for run in runs]
+        print(f"{phase:>7}: median {statistics.median(values):7.1f} ms  max {max(values):7.1f} ms")
+
+    median_total = statistics.median(run["total"] for run in runs) * 1000
+    ok = median_total <= args.budget_ms
+    print(f"budget {args.budget_ms:.0f} ms: {'OK' if ok else 'EXCEEDED'}")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
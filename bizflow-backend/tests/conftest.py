@@ -0,0 +1,71 @@
+"""Shared fixtures: one throwaway SQLite database per test session.
+
+    cd bizflow-backend
+    python -m pytest tests
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+os.environ.setdefault("JWT_SECRET_KEY", "test")
+os.environ.setdefault("DB_QUERY_DEBUG", "false")
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+os.environ.setdefault("OUTBOX_WORKER_ENABLED", "false")
+os.environ["USE_SQLITE"] = "true"
+# The SQLite URL is relative to the working directory
+os.chdir(tempfile.mkdtemp(prefix="bizflow-test-"))
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import models
+from app.auth_utils import create_access_token
+from app.database import SessionLocal
+from app.main import app
+from app.testing import assert_max_queries
+
+
+@pytest.fixture(scope="session")
+def client():
+    # Startup creates the schema
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture
+def db(client):
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture(scope="session")
+def admin(client):
+    session = SessionLocal()
+    user = models.User(email="admin@example.com", hashed_password="-", role="admin")
+    session.add(user)
+    session.commit()
+    session.refresh(user)
+    session.expunge(user)
+    session.close()
+    return user
+
+
+@pytest.fixture(scope="session")
+def auth_headers(client, admin):
+    headers = {"Authorization": f"Bearer {create_access_token({'user_id': admin.id, 'email': admin.email})}"}
+    # Load the user into the auth cache so query budgets measure the endpoint alone
+    assert client.get("/projects/", params={"limit": 1}, headers=headers).status_code == 200
+    return headers
+
+
+@pytest.fixture
+def max_queries():
+    """Fixture form of ``assert_max_queries``: ``with max_queries(3): ...``."""
+    return assert_max_queries
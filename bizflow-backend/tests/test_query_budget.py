@@ -0,0 +1,37 @@
+"""Statement budgets for the busiest list endpoints; an N+1 fails these."""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from app import models
+
+
+@pytest.fixture
+def projects_with_tasks(db, admin):
+    statuses = list(models.TaskStatus)
+    for p in range(10):
+        project = models.Project(name=f"Budget project {p}")
+        db.add(project)
+        db.flush()
+        db.add_all([
+            models.Task(
+                title=f"Budget task {p}-{t}", project_id=project.id, assignee_id=admin.id,
+                status=statuses[t % len(statuses)], due_date=datetime(2024, 1, 1) + timedelta(days=t),
+            )
+            for t in range(5)
+        ])
+    db.commit()
+
+
+@pytest.mark.parametrize("path, budget", [
+    ("/tasks/", 2),
+    ("/tasks/?sort=-priority,due_date", 2),
+    ("/projects/", 2),
+    ("/projects/progress", 3),
+])
+def test_list_query_budget(client, auth_headers, max_queries, projects_with_tasks, path, budget):
+    with max_queries(budget):
+        response = client.get(path, headers=auth_headers)
+    assert response.status_code == 200
+    assert len(response.json()) > 1
@@ -0,0 +1,45 @@
+"""Report validators and cached bodies must follow in-place updates of their source rows."""
+
+from app import models
+from app.models.accounting import TransactionType
+
+
+def test_project_delete_invalidates_accounting_reports(client, auth_headers, db, admin):
+    project = models.Project(name="Report project")
+    db.add(project)
+    db.flush()
+    db.add(models.AccountingEntry(amount=25.0, type=TransactionType.revenue, project_id=project.id, user_id=admin.id))
+    db.commit()
+    project_id = project.id
+
+    paths = ["/reports/summary/by-project", "/reports/accounting/range?group_by=project"]
+    etags = {}
+    for path in paths:
+        response = client.get(path, headers=auth_headers)
+        assert response.status_code == 200
+        assert any(row["project_id"] == project_id for row in response.json())
+        etags[path] = response.headers["etag"]
+
+    # Deleting the project nulls project_id on its entries in place
+    assert client.delete(f"/projects/{project_id}", headers=auth_headers).status_code == 204
+
+    for path in paths:
+        response = client.get(path, headers={**auth_headers, "If-None-Match": etags[path]})
+        assert response.status_code == 200
+        assert all(row["project_id"] != project_id for row in response.json())
+
+
+def test_cached_reports_do_not_read_source_tables(client, auth_headers, max_queries):
+    paths = [
+        "/reports/accounting/range?start=2024-01-01&end=2024-12-31",
+        "/reports/financial/range?group_by=day",
+        "/reports/summary/by-project",
+        "/reports/summary/by-task",
+        "/reports/financial-summary",
+    ]
+    for path in paths:
+        client.get(path, headers=auth_headers)
+        # A cache hit costs one stamp query over the rollup table
+        with max_queries(1) as recorder:
+            assert client.get(path, headers=auth_headers).status_code == 200
+        assert not any("accounting_entries" in shape or "financial_records" in shape for shape in recorder.shapes)
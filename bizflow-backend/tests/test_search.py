@@ -0,0 +1,18 @@
+"""Search ranks from different indexes must be comparable."""
+
+from app import models
+
+
+def test_best_match_of_each_kind_ranks_first(client, auth_headers, db):
+    db.add(models.Project(name="Zebra crossing"))
+    # Many task matches give the task index very different bm25 statistics
+    db.add_all([models.Task(title=f"zebra {i}", description="zebra stripes") for i in range(7)])
+    db.commit()
+
+    response = client.get("/search/", params={"q": "zebra"}, headers=auth_headers)
+    assert response.status_code == 200
+    results = response.json()
+    assert len(results) == 8
+    assert results[0]["rank"] == -1
+    assert "project" in [result["kind"] for result in results if result["rank"] == -1]
+    assert [result["rank"] for result in results] == sorted(result["rank"] for result in results)